@@ -0,0 +1,93 @@
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from quizstats.cache import ANSWER_MATRIX_VERSION, bump_stats_version, bump_version_on_commit
+
+
+def backfill_stats(apps, user_ids=None):
+    """
+    Recompute the stats rollups from the answers table with the historical models of a migration, for data
+    migrations that add the rollups or move answers around. `user_ids` narrows it to the users whose answers moved.
+    Rows are zeroed and upserted, like `answers.utils.rebuild_category_stats`, which needs the current models.
+    """
+    UserAnswer = apps.get_model("answers", "UserAnswer")
+    UserCategoryStats = apps.get_model("answers", "UserCategoryStats")
+    UserCategoryGroupStats = apps.get_model("answers", "UserCategoryGroupStats")
+    UserQuizProgress = apps.get_model("answers", "UserQuizProgress")
+
+    all_answers = UserAnswer.objects.all()
+    category_rows = UserCategoryStats.objects.all()
+    group_rows = UserCategoryGroupStats.objects.all()
+    progress_rows = UserQuizProgress.objects.all()
+    if user_ids is not None:
+        all_answers = all_answers.filter(user_id__in=user_ids)
+        category_rows = category_rows.filter(user_id__in=user_ids)
+        group_rows = group_rows.filter(user_id__in=user_ids)
+        progress_rows = progress_rows.filter(user_id__in=user_ids)
+    # updated_at: the answer matrices of the running servers only pull the rows changed since their last refresh
+    now = timezone.now()
+    zeroed = category_rows.update(correct=0, total=0, updated_at=now)
+    zeroed += group_rows.update(correct=0, total=0, updated_at=now)
+    zeroed += progress_rows.update(answered=0, correct=0, updated_at=now)
+
+    answers = all_answers.filter(question__categories__isnull=False)
+    category_counts = answers.values("user_id", "question__categories").annotate(
+        total=Count("id"), correct=Count("id", filter=Q(is_correct=True))
+    )
+    written = UserCategoryStats.objects.bulk_create(
+        [
+            UserCategoryStats(
+                user_id=row["user_id"],
+                category_id=row["question__categories"],
+                correct=row["correct"],
+                total=row["total"],
+            )
+            for row in category_counts
+        ],
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=["user", "category"],
+        update_fields=["correct", "total", "updated_at"],
+    )
+    # distinct: a question with two categories in the same group counts once for that group
+    group_counts = answers.values("user_id", "question__categories__group").annotate(
+        total=Count("id", distinct=True), correct=Count("id", filter=Q(is_correct=True), distinct=True)
+    )
+    written += UserCategoryGroupStats.objects.bulk_create(
+        [
+            UserCategoryGroupStats(
+                user_id=row["user_id"],
+                group_id=row["question__categories__group"],
+                correct=row["correct"],
+                total=row["total"],
+            )
+            for row in group_counts
+        ],
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=["user", "group"],
+        update_fields=["correct", "total", "updated_at"],
+    )
+
+    progress_counts = all_answers.values("user_id", "question__topic__quiz_part__quiz").annotate(
+        answered=Count("id"), correct=Count("id", filter=Q(is_correct=True))
+    )
+    written += UserQuizProgress.objects.bulk_create(
+        [
+            UserQuizProgress(
+                user_id=row["user_id"],
+                quiz_id=row["question__topic__quiz_part__quiz"],
+                answered=row["answered"],
+                correct=row["correct"],
+            )
+            for row in progress_counts
+        ],
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=["user", "quiz"],
+        update_fields=["answered", "correct", "updated_at"],
+    )
+    # Only when something changed: a new database has no cache table yet, and nothing to invalidate
+    if zeroed or written:
+        bump_stats_version()
+        bump_version_on_commit(ANSWER_MATRIX_VERSION)
@@ -0,0 +1,72 @@
+import numpy as np
+from django.core.cache import cache
+
+from answers.models import UserAnswer
+
+BITSET_TIMEOUT = 60 * 60  # 1 hour, bounding how long a bitset read while an answer was committing can linger
+
+
+def _bitset_key(user_id: int) -> str:
+    return f"answered_questions:{user_id}"
+
+
+class AnsweredBitset:
+    """
+    Set of question ids stored as a bitmap: bit `id` is set when the question has been answered.
+    100k questions fit in 12.5 kB, so a user's whole answer history is one small cache entry.
+    """
+
+    def __init__(self, data: bytes = b""):
+        self.bits = np.frombuffer(data, dtype=np.uint8).copy()
+
+    @classmethod
+    def from_ids(cls, question_ids) -> "AnsweredBitset":
+        bitset = cls()
+        bitset.update(question_ids)
+        return bitset
+
+    def to_bytes(self) -> bytes:
+        return self.bits.tobytes()
+
+    def _grow(self, max_id: int):
+        size = (max_id >> 3) + 1
+        if size > self.bits.size:
+            self.bits = np.concatenate([self.bits, np.zeros(size - self.bits.size, dtype=np.uint8)])
+
+    def update(self, question_ids):
+        ids = np.fromiter(question_ids, dtype=np.int64)
+        if ids.size:
+            self._grow(int(ids.max()))
+            np.bitwise_or.at(self.bits, ids >> 3, (1 << (ids & 7)).astype(np.uint8))
+
+    def __contains__(self, question_id: int) -> bool:
+        byte = question_id >> 3
+        return byte < self.bits.size and bool(self.bits[byte] & (1 << (question_id & 7)))
+
+    def answered_mask(self, question_ids) -> np.ndarray:
+        """Vectorized membership test: a boolean array aligned with `question_ids`."""
+        ids = np.asarray(question_ids, dtype=np.int64)
+        mask = np.zeros(ids.shape, dtype=bool)
+        in_range = (ids >> 3) < self.bits.size
+        mask[in_range] = (self.bits[ids[in_range] >> 3] >> (ids[in_range] & 7)) & 1 == 1
+        return mask
+
+
+def get_answered_bitset(user_id: int) -> AnsweredBitset:
+    key = _bitset_key(user_id)
+    data = cache.get(key)
+    if data is None:
+        bitset = AnsweredBitset.from_ids(
+            UserAnswer.objects.filter(user_id=user_id).values_list("question_id", flat=True)
+        )
+        cache.set(key, bitset.to_bytes(), BITSET_TIMEOUT)
+        return bitset
+    return AnsweredBitset(data)
+
+
+def invalidate_answered_bitsets(user_ids):
+    """
+    Drop the cached bitsets of these users once their answers change; they are rebuilt on their next use.
+    Patching them instead would be a read-modify-write of entries shared by every request of the user, racing them.
+    """
+    cache.delete_many([_bitset_key(user_id) for user_id in user_ids])
@@ -0,0 +1,98 @@
+import time
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from answers.bitsets import _bitset_key, get_answered_bitset
+from answers.models import UserAnswer
+from quizzes.duplicates import get_content_hash
+from quizzes.models import Question, Quiz, QuizPart, Topic
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark unanswered-question filtering with cached answered bitsets against answer-history subqueries. "
+        "Works on synthetic data inside a transaction that is rolled back at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--answers", type=int, default=100_000, help="Total synthetic answers to create")
+        parser.add_argument("--users", type=int, default=10)
+        parser.add_argument("--questions-per-quiz", type=int, default=60)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user, quiz = self.create_data(options["answers"], options["users"], options["questions_per_quiz"])
+            self.stdout.write(
+                f"Synthetic data: {UserAnswer.objects.count()} answers, {Question.objects.count()} questions"
+            )
+            results = [
+                self.report("subquery", options["repeat"], lambda: self.unanswered_by_subquery(user, quiz)),
+                self.report("bitset (cold)", options["repeat"], lambda: self.unanswered_by_bitset(user, quiz, True)),
+                self.report("bitset (cached)", options["repeat"], lambda: self.unanswered_by_bitset(user, quiz)),
+            ]
+            if any(result != results[0] for result in results):
+                self.stderr.write("The approaches disagree on the unanswered questions!")
+            transaction.set_rollback(True)
+
+    def create_data(self, n_answers: int, n_users: int, questions_per_quiz: int):
+        rng = np.random.default_rng(0)
+        answers_per_user = n_answers // n_users
+        # every user answers 80% of the questions
+        n_questions = int(answers_per_user / 0.8)
+        n_quizzes = max(n_questions // questions_per_quiz, 1)
+        quizzes = Quiz.objects.bulk_create(Quiz(season=9000 + i // 50, week=str(i % 50)) for i in range(n_quizzes))
+        parts = QuizPart.objects.bulk_create(QuizPart(quiz=quiz, sequence=1) for quiz in quizzes)
+        topics = Topic.objects.bulk_create(
+            Topic(title=f"Topic {i}", quiz_part=part) for part in parts for i in range(questions_per_quiz // 5)
+        )
+        questions = []
+        for i in range(n_questions):
+            topic = topics[i // 5 % len(topics)]
+            questions.append(
+                Question(
+                    topic=topic, statement=f"Q{i}", answer="A", content_hash=get_content_hash(topic.title, f"Q{i}", "A")
+                )
+            )
+        Question.objects.bulk_create(questions, batch_size=5000)
+        users = User.objects.bulk_create(User(username=f"benchmark-{i}") for i in range(n_users))
+        question_ids = np.array([question.pk for question in questions])
+        for user in users:
+            answered = rng.choice(question_ids, size=answers_per_user, replace=False)
+            UserAnswer.objects.bulk_create(
+                (UserAnswer(user=user, question_id=int(qid), is_correct=bool(qid % 2)) for qid in answered),
+                batch_size=5000,
+            )
+        return users[0], quizzes[len(quizzes) // 2]
+
+    def unanswered_by_subquery(self, user, quiz):
+        answered = UserAnswer.objects.filter(user=user, question=OuterRef("pk"))
+        return list(
+            Question.objects.filter(topic__quiz_part__quiz=quiz).exclude(Exists(answered)).values_list("id", flat=True)
+        )
+
+    def unanswered_by_bitset(self, user, quiz, cold=False):
+        if cold:
+            cache.delete(_bitset_key(user.pk))
+        question_ids = np.array(
+            Question.objects.filter(topic__quiz_part__quiz=quiz).values_list("id", flat=True), dtype=np.int64
+        )
+        return question_ids[~get_answered_bitset(user.pk).answered_mask(question_ids)].tolist()
+
+    def report(self, label: str, repeat: int, func):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            timings.append((time.perf_counter() - start) * 1000)
+        self.stdout.write(
+            f"{label:>16}: median {np.median(timings):8.2f} ms, min {min(timings):8.2f} ms ({len(result)} unanswered)"
+        )
+        return sorted(result)
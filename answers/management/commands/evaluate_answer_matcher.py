@@ -0,0 +1,94 @@
+import json
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from answers.matching import match_answer
+from openai_utils.client import ask_chatgpt
+from openai_utils.loaders import get_prompt
+
+DEFAULT_CASES = Path(__file__).resolve().parent / "data" / "answer_matcher_cases.jsonl"
+
+
+class Command(BaseCommand):
+    help = (
+        "Evaluate the local answer matcher against LLM verdicts: how many answers it decides on its own, "
+        "how often it agrees with the LLM and how much grading latency it saves."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--cases",
+            type=Path,
+            default=DEFAULT_CASES,
+            help="JSON lines with statement, correct_answer, answer and optionally the expected verdict",
+        )
+        parser.add_argument(
+            "--ask-llm",
+            action="store_true",
+            help="Grade every case with the LLM (cached responses included) instead of using the expected verdicts",
+        )
+        parser.add_argument(
+            "--llm-latency-ms",
+            type=float,
+            default=800.0,
+            help="Assumed latency of an LLM grading request, used when the LLM is not asked",
+        )
+
+    def handle(self, *args, **options):
+        with open(options["cases"], "r", encoding="utf-8") as f:
+            cases = [json.loads(line) for line in f if line.strip()]
+
+        local_timings = []
+        llm_timings = []
+        decided = agreed = 0
+        disagreements = []
+        for case in cases:
+            start = time.perf_counter()
+            verdict = match_answer(case["answer"], case["correct_answer"])
+            local_timings.append(time.perf_counter() - start)
+
+            if options["ask_llm"]:
+                prompt = get_prompt(
+                    "check_answer",
+                    statement=case.get("statement", ""),
+                    correct_answer=case["correct_answer"],
+                    answer=case["answer"],
+                )
+                start = time.perf_counter()
+                result = ask_chatgpt(prompt, prompt_name="check_answer")
+                llm_timings.append(time.perf_counter() - start)
+                expected = result is not None and result.strip().lower() == "true"
+            elif "expected" in case:
+                expected = case["expected"]
+            else:
+                continue
+
+            if verdict is None:
+                continue
+            decided += 1
+            if verdict == expected:
+                agreed += 1
+            else:
+                disagreements.append((case, verdict, expected))
+
+        reference = "the LLM" if options["ask_llm"] else "the expected verdicts"
+        llm_latency = sum(llm_timings) / len(llm_timings) if llm_timings else options["llm_latency_ms"] / 1000
+        self.stdout.write(f"Cases: {len(cases)}")
+        self.stdout.write(
+            f"Decided locally: {decided} ({decided / max(len(cases), 1):.0%}), sent to the LLM: {len(cases) - decided}"
+        )
+        self.stdout.write(f"Agreement with {reference} on decided cases: {agreed / max(decided, 1):.1%}")
+        self.stdout.write(
+            f"Mean latency: local {sum(local_timings) / max(len(local_timings), 1) * 1_000_000:.1f} µs, "
+            f"LLM {llm_latency * 1000:.0f} ms ({'measured' if llm_timings else 'assumed'})"
+        )
+        self.stdout.write(f"Grading latency saved: {decided * llm_latency:.1f} s over {decided} answers")
+        for case, verdict, expected in disagreements:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Disagreement: {case['answer']!r} for {case['correct_answer']!r}: local {verdict}, "
+                    f"{'LLM' if options['ask_llm'] else 'expected'} {expected}"
+                )
+            )
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from answers.utils import rebuild_category_stats, rebuild_quiz_progress
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-user category, category group and quiz progress stats from the answers table"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, action="append", help="Only rebuild the stats of this user id")
+
+    def handle(self, *args, **options):
+        user_ids = options["user"]
+        categories_written, groups_written = rebuild_category_stats(user_ids=user_ids)
+        self.stdout.write(f"Wrote {categories_written} category rows and {groups_written} category group rows.")
+        progress_written = rebuild_quiz_progress(user_ids=user_ids)
+        self.stdout.write(f"Wrote {progress_written} quiz progress rows.")
+        self.stdout.write(self.style.SUCCESS("Stats rebuild complete!"))
@@ -0,0 +1,143 @@
+import re
+import unicodedata
+
+from rapidfuzz.distance import Levenshtein
+
+_NON_ALPHANUMERIC = re.compile(r"[^a-z0-9]+")
+_UPPERCASE_WORD = re.compile(r"^[^a-z]*[A-Z][^a-z]*$")
+_ROMAN_NUMERAL = re.compile(r"^(?=[mdclxvi])m{0,4}(cm|cd|d?c{0,3})(xc|xl|l?x{0,3})(ix|iv|v?i{0,3})$", re.IGNORECASE)
+# Alternatives glued to a slash are only split when each one is a word of at least this many letters,
+# so AC/DC, 1/4 and 24/7 stay whole
+MIN_ALTERNATIVE_LENGTH = 3
+
+
+def normalize(text: str) -> str:
+    """
+    Lowercase, strip accents and turn punctuation into single spaces.
+    """
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return _NON_ALPHANUMERIC.sub(" ", text.lower()).strip()
+
+
+def is_uppercase_part(word: str) -> bool:
+    """
+    Whether a word belongs to the UPPERCASE part of an answer, e.g. EXPRESSO, as opposed to initials (F),
+    acronyms (FC, DC) and Roman numerals (VIII), which are part of the name.
+    """
+    letters = [char for char in word if char.isalpha()]
+    return bool(_UPPERCASE_WORD.match(word)) and len(letters) >= 4 and not _ROMAN_NUMERAL.match("".join(letters))
+
+
+def split_alternatives(correct_answer: str) -> list[str]:
+    """
+    The slash-separated alternatives of an answer. A slash with spaces around it always separates alternatives;
+    a bare slash only does when every side is a word, e.g. `Holanda/Países Baixos` but not `AC/DC` or `24/7`.
+    """
+    alternatives = []
+    for alternative in correct_answer.split(" / "):
+        pieces = alternative.split("/")
+        if len(pieces) > 1 and all(
+            len(piece.strip()) >= MIN_ALTERNATIVE_LENGTH and all(char.isalpha() or char.isspace() for char in piece)
+            for piece in pieces
+        ):
+            alternatives.extend(pieces)
+        else:
+            alternatives.append(alternative)
+    return alternatives
+
+
+def answer_variants(correct_answer: str) -> set[str]:
+    """
+    Normalized answers accepted for `correct_answer`, following the rules of the check_answer prompt:
+    any slash-separated alternative is accepted, and when an alternative mixes lowercase and UPPERCASE
+    words (e.g. `Jornal EXPRESSO`), the UPPERCASE part alone is accepted too.
+    """
+    variants = set()
+    for alternative in split_alternatives(correct_answer):
+        words = alternative.split()
+        uppercase_words = [word for word in words if is_uppercase_part(word)]
+        if uppercase_words and len(uppercase_words) < len(words):
+            variants.add(normalize(" ".join(uppercase_words)))
+        variants.add(normalize(alternative))
+    variants.discard("")
+    return variants
+
+
+def name_words(correct_answer: str) -> set[str]:
+    """
+    Normalized words of the capitalized words of an answer: proper names, where one letter can make another name,
+    e.g. Alexandre/Alexandra or Colombia/Columbia.
+    """
+    return {
+        word for raw_word in correct_answer.split() if raw_word[:1].isupper() for word in normalize(raw_word).split()
+    }
+
+
+def is_number(word: str) -> bool:
+    return word.isdigit() or bool(_ROMAN_NUMERAL.match(word))
+
+
+def max_typos(word: str) -> int:
+    # Numbers, Roman numerals and words under 8 letters must match exactly: one edit is already a different answer,
+    # e.g. Monet/Manet, Iceland/Ireland, Vättern/Vänern, Apollo 11/13 or Henry VII/VIII
+    if len(word) < 8 or any(char.isdigit() for char in word) or _ROMAN_NUMERAL.match(word):
+        return 0
+    return 1 if len(word) < 12 else 2
+
+
+def misspelled_words(given: str, variant: str) -> list[str] | None:
+    """
+    The words of `variant` that `given` misspells, word by word, within the tolerance of each word.
+    None when `given` is not `variant` with a few typos; an empty list when they are the same.
+    """
+    given_words, variant_words = given.split(), variant.split()
+    if len(given_words) != len(variant_words):
+        return None
+    misspelled = []
+    for given_word, word in zip(given_words, variant_words):
+        distance = Levenshtein.distance(given_word, word, score_cutoff=max_typos(word))
+        if distance > max_typos(word):
+            return None
+        if distance:
+            misspelled.append(word)
+    return misspelled
+
+
+def differs_only_in_numbers(given: str, variant: str) -> bool:
+    """
+    Whether `given` is `variant` with other numbers, e.g. `Apollo 13` for `Apollo 11` or `Ramses III` for
+    `Ramses II`: the name of a different thing.
+    """
+    given_words, variant_words = given.split(), variant.split()
+    if len(given_words) != len(variant_words) or given_words == variant_words:
+        return False
+    return all(
+        given_word == word or (is_number(given_word) and is_number(word))
+        for given_word, word in zip(given_words, variant_words)
+    )
+
+
+def match_answer(provided_answer: str, correct_answer: str) -> bool | None:
+    """
+    Grade an answer locally.
+    Returns True or False only when the decision is clear-cut: the answer, possibly with typos in long common words,
+    or a different number. Anything else returns None and needs the judgement of the LLM, e.g. a surname only,
+    a part of the answer, a typo in a name, a synonym, an abbreviation or a translation.
+    """
+    given = normalize(provided_answer)
+    if not given:
+        return False
+    variants = answer_variants(correct_answer)
+    if not variants:
+        return None
+    if given in variants:
+        return True
+    names = name_words(correct_answer)
+    for variant in variants:
+        misspelled = misspelled_words(given, variant)
+        if misspelled is not None and not names.intersection(misspelled):
+            return True
+    if all(differs_only_in_numbers(given, variant) for variant in variants):
+        return False
+    return None
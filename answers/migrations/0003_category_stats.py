@@ -0,0 +1,92 @@
+# Generated by Django 5.2.4 on 2026-10-18 11:47
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("answers", "0002_initial"),
+        ("quizzes", "0006_alter_category_description"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserCategoryGroupStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("correct", models.IntegerField(default=0)),
+                ("total", models.IntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True, db_index=True)),
+                (
+                    "group",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="user_stats",
+                        to="quizzes.categorygroup",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="category_group_stats",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "user category group stats",
+                "constraints": [models.UniqueConstraint(fields=("user", "group"), name="unique_user_group_stats")],
+            },
+        ),
+        migrations.CreateModel(
+            name="UserCategoryStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("correct", models.IntegerField(default=0)),
+                ("total", models.IntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True, db_index=True)),
+                (
+                    "category",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="user_stats",
+                        to="quizzes.category",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="category_stats",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "user category stats",
+                "constraints": [
+                    models.UniqueConstraint(fields=("user", "category"), name="unique_user_category_stats")
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:20
+
+from django.db import migrations
+
+from answers.backfill import backfill_stats
+
+
+def backfill_all_stats(apps, schema_editor):
+    # The rollups added by 0003 and 0004 start empty; fill them from the answers given before they existed
+    backfill_stats(apps)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("answers", "0004_user_quiz_progress"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_all_stats, reverse_code=migrations.RunPython.noop),
+    ]
@@ -1,6 +1,6 @@
 from django.db import models
 
-from quizzes.models import Question
+from quizzes.models import Category, CategoryGroup, Question, Quiz
 from users.models import User
 
 
@@ -13,3 +13,59 @@ class UserAnswer(models.Model):
 
     class Meta:
         constraints = [models.UniqueConstraint(fields=["user", "question"], name="unique_user_question_answer")]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored value so the stats signals can tell a flip from a no-op save
+        instance._loaded_is_correct = instance.is_correct
+        return instance
+
+
+class UserCategoryStats(models.Model):
+    """
+    Rollup of a user's answers per category, maintained by the answers signals.
+    """
+
+    user = models.ForeignKey(to=User, on_delete=models.CASCADE, related_name="category_stats")
+    category = models.ForeignKey(to=Category, on_delete=models.CASCADE, related_name="user_stats")
+    correct = models.IntegerField(default=0)
+    total = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["user", "category"], name="unique_user_category_stats")]
+        verbose_name_plural = "user category stats"
+
+
+class UserCategoryGroupStats(models.Model):
+    """
+    Rollup of a user's answers per category group.
+    A question counts once per group, even if several of its categories belong to that group.
+    """
+
+    user = models.ForeignKey(to=User, on_delete=models.CASCADE, related_name="category_group_stats")
+    group = models.ForeignKey(to=CategoryGroup, on_delete=models.CASCADE, related_name="user_stats")
+    correct = models.IntegerField(default=0)
+    total = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["user", "group"], name="unique_user_group_stats")]
+        verbose_name_plural = "user category group stats"
+
+
+class UserQuizProgress(models.Model):
+    """
+    Answered/correct counters of a user per quiz, maintained by the answers signals.
+    """
+
+    user = models.ForeignKey(to=User, on_delete=models.CASCADE, related_name="quiz_progress")
+    quiz = models.ForeignKey(to=Quiz, on_delete=models.CASCADE, related_name="user_progress")
+    answered = models.IntegerField(default=0)
+    correct = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["user", "quiz"], name="unique_user_quiz_progress")]
+        verbose_name_plural = "user quiz progress"
@@ -1,10 +1,30 @@
+import logging
+
 from rest_framework import serializers
 
+from answers.matching import match_answer
 from answers.models import UserAnswer
+from answers.utils import save_answers
 from openai_utils.client import ask_chatgpt
 from openai_utils.loaders import get_prompt
 from quizzes.models import Question
 
+logger = logging.getLogger(__name__)
+
+
+def parse_verdict(text: str) -> bool | None:
+    """
+    The verdict of an LLM grading answer, None if it is neither `true` nor `false`.
+    """
+    return {"true": True, "false": False}.get(text.strip().lower())
+
+
+def ask_verdict(provided_answer: str, question: Question) -> bool | None:
+    prompt = get_prompt(
+        "check_answer", statement=question.statement, correct_answer=question.answer, answer=provided_answer
+    )
+    return parse_verdict(ask_chatgpt(prompt, prompt_name="check_answer") or "")
+
 
 class UserAnswerSerializer(serializers.ModelSerializer):
     answer = serializers.CharField(required=False, write_only=True)
@@ -33,8 +53,96 @@ class UserAnswerSerializer(serializers.ModelSerializer):
         return user_answer
 
     def check_answer(self, provided_answer: str, question: Question):
-        prompt = get_prompt(
-            "check_answer", statement=question.statement, correct_answer=question.answer, answer=provided_answer
+        verdict = match_answer(provided_answer, question.answer)
+        if verdict is not None:
+            return verdict
+        return ask_verdict(provided_answer, question) is True
+
+
+class UserAnswerBulkItemSerializer(serializers.Serializer):
+    question = serializers.IntegerField()
+    is_correct = serializers.BooleanField(required=False)
+    answer = serializers.CharField(required=False)
+
+    def validate(self, data):
+        if data.get("is_correct") is None and data.get("answer") is None:
+            raise serializers.ValidationError("Either 'is_correct' or 'answer' must be provided.")
+        return data
+
+
+class UserAnswerBulkSerializer(serializers.Serializer):
+    answers = UserAnswerBulkItemSerializer(many=True, allow_empty=False, max_length=200)
+
+    def validate_answers(self, answers):
+        question_ids = [item["question"] for item in answers]
+        if len(set(question_ids)) != len(question_ids):
+            raise serializers.ValidationError("Each question can only be answered once per request.")
+        # One query for the whole batch instead of a PrimaryKeyRelatedField lookup per item
+        questions = Question.objects.in_bulk(question_ids)
+        missing = [question_id for question_id in question_ids if question_id not in questions]
+        if missing:
+            raise serializers.ValidationError(f"Invalid questions: {missing}")
+        for item in answers:
+            item["question"] = questions[item["question"]]
+        return answers
+
+    def create(self, validated_data):
+        """
+        Grade and save the answers, returning one result per item in request order.
+        Answers the LLM gave no verdict for are not saved; their result carries an error instead.
+        """
+        user = self.context["request"].user
+        items = validated_data["answers"]
+        for item in items:
+            if "is_correct" not in item:
+                verdict = match_answer(item["answer"], item["question"].answer)
+                if verdict is not None:
+                    item["is_correct"] = verdict
+        free_text = [item for item in items if "is_correct" not in item]
+        verdicts = self.check_answers([(item["question"], item["answer"]) for item in free_text])
+        for item, is_correct in zip(free_text, verdicts):
+            if is_correct is not None:
+                item["is_correct"] = is_correct
+        graded = [item for item in items if "is_correct" in item]
+        saved = save_answers(user.pk, {item["question"].pk: item["is_correct"] for item in graded})
+        results = {
+            answer.question_id: {
+                "id": answer.pk,
+                "question": answer.question_id,
+                "is_correct": answer.is_correct,
+                "created": created,
+            }
+            for answer, created in saved
+        }
+        return [
+            results.get(item["question"].pk)
+            or {"question": item["question"].pk, "error": "The answer could not be graded, try again later."}
+            for item in items
+        ]
+
+    def check_answers(self, items: list[tuple[Question, str]]) -> list[bool | None]:
+        """
+        Grade the answers the local matcher could not decide in a single request. Those the reply has no verdict
+        for are graded one by one, and are None if that fails too.
+        """
+        if not items:
+            return []
+        entries = "\n\n".join(
+            f"{number}. Question: '{question.statement}'\nCorrect answer: '{question.answer}'\nUser answer: '{answer}'"
+            for number, (question, answer) in enumerate(items, start=1)
         )
-        result = ask_chatgpt(prompt)
-        return result is not None and result.strip().lower() == "true"
+        result = ask_chatgpt(get_prompt("check_answers", answers=entries), prompt_name="check_answers") or ""
+        verdicts = {}
+        for line in result.splitlines():
+            number, separator, verdict = line.partition(":")
+            if separator and number.strip().isdigit():
+                verdicts[int(number)] = parse_verdict(verdict)
+        missing = [number for number in range(1, len(items) + 1) if verdicts.get(number) is None]
+        if missing:
+            logger.warning(
+                f"No verdict for {len(missing)} of {len(items)} answers in the batch, grading them one by one"
+            )
+        for number in missing:
+            question, answer = items[number - 1]
+            verdicts[number] = ask_verdict(answer, question)
+        return [verdicts[number] for number in range(1, len(items) + 1)]
@@ -0,0 +1,48 @@
+from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.dispatch import receiver
+
+from answers.models import UserAnswer
+from answers.utils import rebuild_category_stats, record_answer_changes, refresh_category_stats_for_questions
+from quizzes.models import Question
+
+
+@receiver(post_save, sender=UserAnswer)
+def update_stats_on_answer_save(sender, instance: UserAnswer, created, **kwargs):
+    previous = getattr(instance, "_loaded_is_correct", None)
+    if created:
+        record_answer_changes([(instance.user_id, instance.question_id, 1, int(instance.is_correct))])
+    elif previous is None:
+        # saved without being loaded first, so there is no way to know what changed
+        links = list(instance.question.categories.values_list("id", "group_id"))
+        rebuild_category_stats(
+            user_ids=[instance.user_id],
+            category_ids={category_id for category_id, _ in links},
+            group_ids={group_id for _, group_id in links},
+        )
+    elif previous != instance.is_correct:
+        record_answer_changes([(instance.user_id, instance.question_id, 0, int(instance.is_correct) - int(previous))])
+    instance._loaded_is_correct = instance.is_correct
+
+
+@receiver(pre_delete, sender=UserAnswer)
+def update_stats_on_answer_delete(sender, instance: UserAnswer, **kwargs):
+    # pre_delete: the question's category links may be gone by post_delete when the question itself is deleted
+    is_correct = getattr(instance, "_loaded_is_correct", instance.is_correct)
+    record_answer_changes([(instance.user_id, instance.question_id, -1, -int(is_correct))])
+
+
+@receiver(m2m_changed, sender=Question.categories.through)
+def update_stats_on_question_categories_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear":
+        # clear() does not send the removed pks, so remember them for post_clear
+        related = instance.questions if reverse else instance.categories
+        instance._cleared_pks = set(related.values_list("id", flat=True))
+        return
+    if action == "post_clear":
+        pk_set = getattr(instance, "_cleared_pks", set())
+    elif action not in ("post_add", "post_remove"):
+        return
+    if reverse:
+        refresh_category_stats_for_questions(question_ids=pk_set, category_ids={instance.pk})
+    else:
+        refresh_category_stats_for_questions(question_ids={instance.pk}, category_ids=pk_set)
@@ -0,0 +1,111 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from answers.models import UserAnswer, UserCategoryStats, UserQuizProgress
+from quizstats.testing import create_answered_questions, create_quiz_part, get_test_categories, local_cache
+
+User = get_user_model()
+
+
+@local_cache
+class UserAnswerBulkTests(TestCase):
+    """
+    Answers submitted in bulk: graded locally when possible and by the LLM in one request otherwise,
+    then upserted in one statement with the rollups kept in step.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        _, cls.category, _ = get_test_categories()
+        cls.user = User.objects.create_user(username="alice", password="pw")
+        cls.questions = create_answered_questions(
+            create_quiz_part(), [(cls.category, {cls.user: False})] + [(cls.category, {})] * 2
+        )
+        cls.url = reverse("useranswer-bulk-create")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        patcher = mock.patch("answers.serializers.ask_chatgpt")
+        self.ask_chatgpt = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self, *answers):
+        response = self.client.post(self.url, {"answers": list(answers)}, format="json")
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def assertRollups(self, answered, correct):
+        category_stats = UserCategoryStats.objects.get(user=self.user, category=self.category)
+        progress = UserQuizProgress.objects.get(user=self.user, quiz=self.questions[0].topic.quiz_part.quiz)
+        self.assertEqual((category_stats.total, category_stats.correct), (answered, correct))
+        self.assertEqual((progress.answered, progress.correct), (answered, correct))
+
+    def test_upsert(self):
+        first, second, _ = self.questions
+        results = self.post({"question": second.pk, "is_correct": False}, {"question": first.pk, "is_correct": True})
+
+        # In request order; the answer to the first question is updated in place
+        previous = UserAnswer.objects.get(user=self.user, question=first)
+        self.assertEqual(results[1], {"id": previous.pk, "question": first.pk, "is_correct": True, "created": False})
+        self.assertEqual(results[0]["question"], second.pk)
+        self.assertEqual((results[0]["is_correct"], results[0]["created"]), (False, True))
+        self.assertEqual(UserAnswer.objects.filter(user=self.user).count(), 2)
+        self.assertRollups(answered=2, correct=1)
+        self.ask_chatgpt.assert_not_called()
+
+    def test_graded_locally(self):
+        first, second, _ = self.questions
+        results = self.post({"question": first.pk, "answer": "answer 0"}, {"question": second.pk, "answer": "Answer 9"})
+        self.assertEqual([result["is_correct"] for result in results], [True, False])
+        self.assertRollups(answered=2, correct=1)
+        self.ask_chatgpt.assert_not_called()
+
+    def test_graded_in_one_request(self):
+        first, second, third = self.questions
+        self.ask_chatgpt.return_value = "1: true\n2: false"
+        results = self.post(
+            {"question": first.pk, "answer": "Lima"},
+            {"question": second.pk, "answer": "answer 1"},
+            {"question": third.pk, "answer": "Cusco"},
+        )
+        self.assertEqual([result["is_correct"] for result in results], [True, True, False])
+        self.assertEqual(self.ask_chatgpt.call_count, 1)
+        self.assertRollups(answered=3, correct=2)
+
+    def test_missing_verdict_graded_on_its_own(self):
+        first, _, third = self.questions
+        self.ask_chatgpt.side_effect = ["1: true", "false"]
+        results = self.post({"question": first.pk, "answer": "Lima"}, {"question": third.pk, "answer": "Cusco"})
+        self.assertEqual([result["is_correct"] for result in results], [True, False])
+        self.assertEqual(
+            [call.kwargs["prompt_name"] for call in self.ask_chatgpt.call_args_list], ["check_answers", "check_answer"]
+        )
+        self.assertRollups(answered=2, correct=1)
+
+    def test_no_verdict(self):
+        first, second, _ = self.questions
+        self.ask_chatgpt.return_value = None
+        results = self.post({"question": first.pk, "answer": "Lima"}, {"question": second.pk, "is_correct": True})
+
+        # Not saved as wrong: the previous answer is kept and the item reports the error
+        self.assertEqual(set(results[0]), {"question", "error"})
+        self.assertEqual(results[1]["is_correct"], True)
+        self.assertFalse(UserAnswer.objects.get(user=self.user, question=first).is_correct)
+        self.assertRollups(answered=2, correct=1)
+
+    def test_invalid(self):
+        first, _, _ = self.questions
+        for answers in [
+            [{"question": first.pk, "is_correct": True}, {"question": first.pk, "is_correct": False}],
+            [{"question": 0, "is_correct": True}],
+            [{"question": first.pk}],
+        ]:
+            with self.subTest(answers=answers):
+                response = self.client.post(self.url, {"answers": answers}, format="json")
+                self.assertEqual(response.status_code, 400)
+        self.assertRollups(answered=1, correct=0)
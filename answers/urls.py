@@ -1,8 +1,9 @@
 from django.urls import path
 
-from answers.views import UserAnswerView
+from answers.views import UserAnswerBulkView, UserAnswerView
 
 urlpatterns = [
     # api/answers/
     path("", UserAnswerView.as_view(), name="useranswer-create"),
+    path("bulk/", UserAnswerBulkView.as_view(), name="useranswer-bulk-create"),
 ]
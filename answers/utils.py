@@ -0,0 +1,263 @@
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from answers.bitsets import invalidate_answered_bitsets
+from answers.models import UserAnswer, UserCategoryGroupStats, UserCategoryStats, UserQuizProgress
+from quizstats.cache import (
+    ANSWER_MATRIX_VERSION,
+    bump_stats_version,
+    bump_user_stats_versions,
+    bump_version_on_commit,
+)
+from quizzes.models import Category, Question, Quiz
+from quizzes.pools import drop_unanswered_topic_pools
+
+QuestionCategory = Question.categories.through
+
+
+def _apply_deltas(model, key_field: str, deltas: dict[tuple[int, int], list[int]], count_field: str = "total"):
+    deltas = {key: delta for key, delta in deltas.items() if any(delta)}
+    if not deltas:
+        return
+    model.objects.bulk_create(
+        [model(user_id=user_id, **{key_field: key_id}) for user_id, key_id in deltas], ignore_conflicts=True
+    )
+    # One UPDATE per distinct delta, which in practice is one or two statements per write
+    keys_by_delta = defaultdict(list)
+    for key, delta in deltas.items():
+        keys_by_delta[tuple(delta)].append(key)
+    now = timezone.now()
+    for (total_delta, correct_delta), keys in keys_by_delta.items():
+        condition = reduce(or_, (Q(user_id=user_id, **{key_field: key_id}) for user_id, key_id in keys))
+        model.objects.filter(condition).update(
+            **{count_field: F(count_field) + total_delta}, correct=F("correct") + correct_delta, updated_at=now
+        )
+
+
+def record_answer_changes(changes: list[tuple[int, int, int, int]]):
+    """
+    Apply answer changes to the stats rollups and the quiz progress counters, and drop the cached answered bitsets
+    and unanswered topic pools of the users whose answered questions changed.
+    Each change is a (user_id, question_id, total_delta, correct_delta) tuple, e.g. (u, q, 1, 1) for a new
+    correct answer, (u, q, 0, -1) for an answer flipped to wrong and (u, q, -1, 0) for a deleted wrong answer.
+    """
+    changes = [change for change in changes if change[2] or change[3]]
+    if not changes:
+        return
+    question_ids = {question_id for _, question_id, _, _ in changes}
+    links = QuestionCategory.objects.filter(question_id__in=question_ids).values_list(
+        "question_id", "category_id", "category__group_id"
+    )
+    question_categories = defaultdict(set)
+    question_groups = defaultdict(set)
+    for question_id, category_id, group_id in links:
+        question_categories[question_id].add(category_id)
+        question_groups[question_id].add(group_id)
+    question_quizzes = dict(Question.objects.filter(id__in=question_ids).values_list("id", "topic__quiz_part__quiz_id"))
+
+    category_deltas = defaultdict(lambda: [0, 0])
+    group_deltas = defaultdict(lambda: [0, 0])
+    quiz_deltas = defaultdict(lambda: [0, 0])
+    for user_id, question_id, total_delta, correct_delta in changes:
+        for category_id in question_categories[question_id]:
+            category_deltas[(user_id, category_id)][0] += total_delta
+            category_deltas[(user_id, category_id)][1] += correct_delta
+        for group_id in question_groups[question_id]:
+            group_deltas[(user_id, group_id)][0] += total_delta
+            group_deltas[(user_id, group_id)][1] += correct_delta
+        if question_id in question_quizzes:
+            quiz_deltas[(user_id, question_quizzes[question_id])][0] += total_delta
+            quiz_deltas[(user_id, question_quizzes[question_id])][1] += correct_delta
+
+    with transaction.atomic():
+        _apply_deltas(UserCategoryStats, "category_id", category_deltas)
+        _apply_deltas(UserCategoryGroupStats, "group_id", group_deltas)
+        _apply_deltas(UserQuizProgress, "quiz_id", quiz_deltas, count_field="answered")
+        bump_user_stats_versions(user_id for user_id, _, _, _ in changes)
+    answered_user_ids = {user_id for user_id, _, total_delta, _ in changes if total_delta}
+    if answered_user_ids:
+        # Once committed, so a request reading them in the meantime cannot cache the answers from before again
+        transaction.on_commit(lambda: invalidate_answered_sets(answered_user_ids))
+
+
+def invalidate_answered_sets(user_ids):
+    invalidate_answered_bitsets(user_ids)
+    drop_unanswered_topic_pools(user_ids)
+
+
+def rebuild_category_stats(user_ids=None, category_ids=None, group_ids=None):
+    """
+    Recompute the stats rollups from the answers table.
+    Each argument narrows the rebuild; leaving all of them as None rebuilds everything.
+    Rows are zeroed and upserted instead of deleted, so every touched row gets a fresh `updated_at`. That timestamp
+    is taken before the rebuild, which may take long enough to commit after the overlap of the answer matrix delta
+    refresh, so the matrices are made to reload in full.
+    Returns the number of (user, category) and (user, group) rows written.
+    """
+    answers = UserAnswer.objects.all()
+    category_rows = UserCategoryStats.objects.all()
+    group_rows = UserCategoryGroupStats.objects.all()
+    if user_ids is not None:
+        answers = answers.filter(user_id__in=user_ids)
+        category_rows = category_rows.filter(user_id__in=user_ids)
+        group_rows = group_rows.filter(user_id__in=user_ids)
+
+    category_answers = answers.filter(question__categories__isnull=False)
+    if category_ids is not None:
+        category_answers = answers.filter(question__categories__in=category_ids)
+        category_rows = category_rows.filter(category_id__in=category_ids)
+    category_counts = category_answers.values("user_id", "question__categories").annotate(
+        total=Count("id"), correct=Count("id", filter=Q(is_correct=True))
+    )
+
+    group_answers = answers.filter(question__categories__isnull=False)
+    if group_ids is not None:
+        group_answers = answers.filter(question__categories__group__in=group_ids)
+        group_rows = group_rows.filter(group_id__in=group_ids)
+    # distinct: a question with two categories in the same group counts once for that group
+    group_counts = group_answers.values("user_id", "question__categories__group").annotate(
+        total=Count("id", distinct=True), correct=Count("id", filter=Q(is_correct=True), distinct=True)
+    )
+
+    now = timezone.now()
+    with transaction.atomic():
+        category_rows.update(correct=0, total=0, updated_at=now)
+        group_rows.update(correct=0, total=0, updated_at=now)
+        written_categories = UserCategoryStats.objects.bulk_create(
+            [
+                UserCategoryStats(
+                    user_id=row["user_id"],
+                    category_id=row["question__categories"],
+                    correct=row["correct"],
+                    total=row["total"],
+                    updated_at=now,
+                )
+                for row in category_counts
+            ],
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["user", "category"],
+            update_fields=["correct", "total", "updated_at"],
+        )
+        written_groups = UserCategoryGroupStats.objects.bulk_create(
+            [
+                UserCategoryGroupStats(
+                    user_id=row["user_id"],
+                    group_id=row["question__categories__group"],
+                    correct=row["correct"],
+                    total=row["total"],
+                    updated_at=now,
+                )
+                for row in group_counts
+            ],
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["user", "group"],
+            update_fields=["correct", "total", "updated_at"],
+        )
+        if user_ids is None:
+            bump_stats_version()
+        else:
+            bump_user_stats_versions(user_ids)
+        bump_version_on_commit(ANSWER_MATRIX_VERSION)
+    return len(written_categories), len(written_groups)
+
+
+def refresh_category_stats_for_questions(question_ids, category_ids):
+    """
+    Rebuild the rollups touched by a change in the categories of the given questions.
+    """
+    if not question_ids or not category_ids:
+        return
+    user_ids = set(UserAnswer.objects.filter(question_id__in=question_ids).values_list("user_id", flat=True))
+    if not user_ids:
+        return
+    group_ids = set(Category.objects.filter(id__in=category_ids).values_list("group_id", flat=True))
+    rebuild_category_stats(user_ids=user_ids, category_ids=category_ids, group_ids=group_ids)
+
+
+def rebuild_quiz_progress(user_ids=None):
+    """
+    Recompute the question totals of every quiz and the per-user quiz progress counters.
+    Returns the number of (user, quiz) rows written.
+    """
+    question_counts = (
+        Question.objects.filter(topic__quiz_part__quiz=OuterRef("pk"))
+        .order_by()
+        .values("topic__quiz_part__quiz")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    answers = UserAnswer.objects.all()
+    progress_rows = UserQuizProgress.objects.all()
+    if user_ids is not None:
+        answers = answers.filter(user_id__in=user_ids)
+        progress_rows = progress_rows.filter(user_id__in=user_ids)
+    progress_counts = answers.values("user_id", "question__topic__quiz_part__quiz").annotate(
+        answered=Count("id"), correct=Count("id", filter=Q(is_correct=True))
+    )
+
+    now = timezone.now()
+    with transaction.atomic():
+        Quiz.objects.update(total_questions=Coalesce(Subquery(question_counts), 0))
+        progress_rows.update(answered=0, correct=0, updated_at=now)
+        written = UserQuizProgress.objects.bulk_create(
+            [
+                UserQuizProgress(
+                    user_id=row["user_id"],
+                    quiz_id=row["question__topic__quiz_part__quiz"],
+                    answered=row["answered"],
+                    correct=row["correct"],
+                    updated_at=now,
+                )
+                for row in progress_counts
+            ],
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["user", "quiz"],
+            update_fields=["answered", "correct", "updated_at"],
+        )
+        # The question totals of every quiz are part of the progress of every user
+        bump_stats_version()
+    return len(written)
+
+
+def save_answers(user_id: int, answers: dict[int, bool]) -> list[tuple[UserAnswer, bool]]:
+    """
+    Upsert the answers of a user in one statement and apply the resulting changes to the rollups.
+    `answers` maps question ids to correctness. Bulk writes skip the model signals, so the changes are
+    computed here from the stored rows, which are locked until the upsert commits.
+    Returns (answer, created) pairs in the order of `answers`.
+    """
+    with transaction.atomic():
+        previous = dict(
+            UserAnswer.objects.select_for_update()
+            .filter(user_id=user_id, question_id__in=answers)
+            .values_list("question_id", "is_correct")
+        )
+        saved = UserAnswer.objects.bulk_create(
+            [
+                UserAnswer(user_id=user_id, question_id=question_id, is_correct=is_correct)
+                for question_id, is_correct in answers.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["user", "question"],
+            update_fields=["is_correct", "updated_at"],
+        )
+        changes = [
+            (
+                user_id,
+                question_id,
+                0 if question_id in previous else 1,
+                int(is_correct) - int(previous.get(question_id, False)),
+            )
+            for question_id, is_correct in answers.items()
+        ]
+        record_answer_changes(changes)
+    return [(answer, answer.question_id not in previous) for answer in saved]
@@ -1,8 +1,9 @@
-from rest_framework import generics
+from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
 from answers.models import UserAnswer
-from answers.serializers import UserAnswerSerializer
+from answers.serializers import UserAnswerBulkSerializer, UserAnswerSerializer
 
 
 class UserAnswerView(generics.CreateAPIView):
@@ -17,3 +18,14 @@ class UserAnswerView(generics.CreateAPIView):
         context = super().get_serializer_context()
         context["request"] = self.request
         return context
+
+
+class UserAnswerBulkView(generics.GenericAPIView):
+    serializer_class = UserAnswerBulkSerializer
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = serializer.save()
+        return Response(results, status=status.HTTP_200_OK)
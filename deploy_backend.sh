@@ -21,10 +21,22 @@ pip install -r requirements.txt
 echo "Applying migrations..."
 python manage.py migrate --noinput
 
+echo "Creating cache table..."
+python manage.py createcachetable
+
+echo "Warming stats cache..."
+python manage.py warm_stats_cache
+
 echo "Collecting static files..."
 python manage.py collectstatic --noinput
 
 echo "Restarting backend service..."
 sudo systemctl restart qs-backend
 
+echo "Restarting job worker..."
+sudo cp qs-worker.service /etc/systemd/system/qs-worker.service
+sudo systemctl daemon-reload
+sudo systemctl enable qs-worker
+sudo systemctl restart qs-worker
+
 echo "Backend deployed successfully."
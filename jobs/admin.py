@@ -0,0 +1,38 @@
+from django.contrib import admin, messages
+from django.db.models import QuerySet
+from django.utils import timezone
+from django.utils.html import format_html
+
+from jobs.models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("__str__", "status", "progress", "failed_items", "rate", "attempts", "created_at", "finished_at")
+    list_filter = ("status", "name")
+    ordering = ("-created_at",)
+    readonly_fields = [field.name for field in Job._meta.fields] + ["progress", "rate"]
+    actions = ["retry_jobs"]
+
+    @admin.display(description="Progress")
+    def progress(self, obj: Job):
+        if not obj.total:
+            return obj.processed
+        return format_html(
+            '<progress value="{}" max="{}"></progress> {}/{}', obj.processed, obj.total, obj.processed, obj.total
+        )
+
+    @admin.display(description="Items/s")
+    def rate(self, obj: Job):
+        throughput = obj.throughput
+        return f"{throughput:.2f}" if throughput is not None else "-"
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description="Retry selected failed jobs")
+    def retry_jobs(self, request, queryset: QuerySet[Job]):
+        retried = queryset.filter(status=Job.Status.FAILED).update(
+            status=Job.Status.PENDING, attempts=0, run_after=timezone.now(), error=""
+        )
+        self.message_user(request, f"Queued {retried} jobs again.", messages.INFO)
@@ -0,0 +1,51 @@
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from jobs.worker import STALE_JOB_TIMEOUT, requeue_stale_jobs, run_next_job
+
+
+class Command(BaseCommand):
+    help = "Run queued jobs from the jobs table, with a pool of worker threads"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=4, help="Number of jobs run concurrently")
+        parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds to wait when the queue is empty")
+        parser.add_argument("--once", action="store_true", help="Exit once the queue is empty")
+        parser.add_argument(
+            "--stale-after",
+            type=float,
+            default=STALE_JOB_TIMEOUT.total_seconds() / 60,
+            help="Minutes without a heartbeat after which a running job is considered abandoned and requeued",
+        )
+
+    def handle(self, *args, **options):
+        name = f"{socket.gethostname()}:{os.getpid()}"
+        stop = threading.Event()
+        stale_after = timedelta(minutes=options["stale_after"])
+        self.stdout.write(f"Worker {name} started with {options['threads']} threads.")
+
+        def loop(thread_index: int):
+            worker = f"{name}:{thread_index}"
+            while not stop.is_set():
+                if not run_next_job(worker):
+                    # An idle worker recovers the jobs of workers that died mid-run
+                    requeue_stale_jobs(stale_after)
+                    if options["once"]:
+                        return
+                    time.sleep(options["poll_interval"])
+
+        with ThreadPoolExecutor(max_workers=options["threads"]) as executor:
+            futures = [executor.submit(loop, index) for index in range(options["threads"])]
+            try:
+                for future in futures:
+                    future.result()
+            except KeyboardInterrupt:
+                stop.set()
+                self.stdout.write("Stopping after the running jobs...")
+        self.stdout.write(self.style.SUCCESS("Worker stopped."))
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:51
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def start_heartbeats(apps, schema_editor):
+    # Jobs running during the upgrade count as alive since they started
+    Job = apps.get_model("jobs", "Job")
+    Job.objects.filter(status="running").update(heartbeat_at=F("started_at"))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("jobs", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="heartbeat_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Last progress report of the running attempt, to tell a live run from a dead one",
+                null=True,
+            ),
+        ),
+        migrations.RunPython(start_heartbeats, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,70 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """
+    A unit of slow work, run outside the request cycle by the `run_worker` command.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        SUCCEEDED = "succeeded", "Succeeded"
+        FAILED = "failed", "Failed"
+
+    name = models.CharField(max_length=100, help_text="Name of the registered handler that runs this job")
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING, db_index=True)
+    total = models.PositiveIntegerField(default=0, help_text="Number of items to process")
+    processed = models.PositiveIntegerField(default=0)
+    failed_items = models.PositiveIntegerField(default=0)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    worker = models.CharField(max_length=100, blank=True)
+    run_after = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Last progress report of the running attempt, to tell a live run from a dead one",
+    )
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "run_after"], name="job_status_run_after_idx")]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk}"
+
+    @property
+    def throughput(self) -> float | None:
+        """
+        Processed items per second of the current (or last) attempt.
+        """
+        if not self.started_at or not self.processed:
+            return None
+        elapsed = ((self.finished_at or timezone.now()) - self.started_at).total_seconds()
+        return self.processed / elapsed if elapsed else None
+
+    def report_progress(self, processed: int = 0, failed: int = 0):
+        """
+        Add to the progress counters and record a heartbeat. Handlers call this as they go, so the admin shows live
+        progress and the worker knows the job is alive; a long step without items can report 0 to stay alive.
+        Only the current attempt is updated, so a run that was given up on cannot overwrite its replacement.
+        """
+        self.processed += processed
+        self.failed_items += failed
+        self.heartbeat_at = timezone.now()
+        self.current_attempt().update(
+            processed=self.processed, failed_items=self.failed_items, heartbeat_at=self.heartbeat_at
+        )
+
+    def current_attempt(self):
+        """
+        This job, as long as it is still running the attempt this instance claimed.
+        """
+        return Job.objects.filter(pk=self.pk, status=Job.Status.RUNNING, attempts=self.attempts)
@@ -0,0 +1,25 @@
+from jobs.models import Job
+
+_handlers = {}
+
+
+def register(name: str):
+    """
+    Register a job handler. Handlers receive the Job and may return a JSON-serializable result.
+    """
+
+    def decorator(handler):
+        _handlers[name] = handler
+        return handler
+
+    return decorator
+
+
+def get_handler(name: str):
+    return _handlers[name]
+
+
+def enqueue(name: str, payload: dict | None = None, total: int = 0, max_attempts: int = 3) -> Job:
+    if name not in _handlers:
+        raise KeyError(f"No job handler registered as {name!r}")
+    return Job.objects.create(name=name, payload=payload or {}, total=total, max_attempts=max_attempts)
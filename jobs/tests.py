@@ -0,0 +1,62 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.registry import register
+from jobs.worker import STALE_JOB_TIMEOUT, claim_job, requeue_stale_jobs, run_job
+
+STALE = timezone.now() - STALE_JOB_TIMEOUT - timedelta(minutes=1)
+
+
+@register("test_noop")
+def noop_job(job: Job):
+    job.report_progress(processed=1)
+    return {"ok": True}
+
+
+class RequeueStaleJobsTests(TestCase):
+    def running_job(self, heartbeat_at, attempts=1, started_at=STALE):
+        return Job.objects.create(
+            name="test_noop",
+            status=Job.Status.RUNNING,
+            attempts=attempts,
+            started_at=started_at,
+            heartbeat_at=heartbeat_at,
+        )
+
+    def test_requeues_jobs_without_heartbeat(self):
+        stale = self.running_job(heartbeat_at=STALE)
+        out_of_attempts = self.running_job(heartbeat_at=STALE, attempts=3)
+        self.assertEqual(requeue_stale_jobs(), 2)
+        stale.refresh_from_db()
+        out_of_attempts.refresh_from_db()
+        self.assertEqual(stale.status, Job.Status.PENDING)
+        self.assertEqual(out_of_attempts.status, Job.Status.FAILED)
+
+    def test_long_job_with_heartbeat_is_left_running(self):
+        # Started long ago, but still reporting progress
+        job = self.running_job(heartbeat_at=STALE)
+        job.report_progress(processed=5)
+        self.assertEqual(requeue_stale_jobs(), 0)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed), (Job.Status.RUNNING, 5))
+
+    def test_outcome_of_a_requeued_run_is_dropped(self):
+        Job.objects.create(name="test_noop")
+        first_run = claim_job("first")
+        Job.objects.filter(pk=first_run.pk).update(heartbeat_at=STALE)
+        requeue_stale_jobs()
+        second_run = claim_job("second")
+        self.assertEqual(second_run.attempts, 2)
+
+        # The first run comes back to life and finishes: it must not touch the second one
+        run_job(first_run)
+        second_run.refresh_from_db()
+        self.assertEqual((second_run.status, second_run.processed), (Job.Status.RUNNING, 0))
+
+        run_job(second_run)
+        second_run.refresh_from_db()
+        self.assertEqual(second_run.status, Job.Status.SUCCEEDED)
+        self.assertEqual((second_run.processed, second_run.result), (1, {"ok": True}))
@@ -0,0 +1,109 @@
+import logging
+import traceback
+from datetime import timedelta
+
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.registry import get_handler
+
+logger = logging.getLogger(__name__)
+
+RETRY_DELAY = timedelta(seconds=30)
+# A running job without a heartbeat for this long is assumed to belong to a worker that died, e.g. killed by a deploy
+STALE_JOB_TIMEOUT = timedelta(minutes=15)
+
+
+def requeue_stale_jobs(timeout: timedelta = STALE_JOB_TIMEOUT) -> int:
+    """
+    Put back in the queue the running jobs without a heartbeat for `timeout`, or fail those out of attempts.
+    A job is as old as its last progress report, so a long job that keeps reporting is never run twice.
+    Returns the number of jobs requeued or failed.
+    """
+    now = timezone.now()
+    stale = Job.objects.filter(status=Job.Status.RUNNING, heartbeat_at__lt=now - timeout)
+    failed = stale.filter(attempts__gte=F("max_attempts")).update(
+        status=Job.Status.FAILED, error="Abandoned by its worker", finished_at=now
+    )
+    requeued = stale.update(status=Job.Status.PENDING, run_after=now)
+    if failed or requeued:
+        logger.warning(f"Requeued {requeued} and failed {failed} jobs abandoned by their workers")
+    return failed + requeued
+
+
+def claim_job(worker: str) -> Job | None:
+    """
+    Atomically take the oldest runnable job. SKIP LOCKED lets concurrent workers claim different jobs.
+    """
+    with transaction.atomic():
+        job = (
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status=Job.Status.PENDING, run_after__lte=timezone.now())
+            .order_by("run_after", "id")
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = Job.Status.RUNNING
+        job.worker = worker
+        job.attempts += 1
+        job.started_at = job.heartbeat_at = timezone.now()
+        job.finished_at = None
+        job.processed = 0
+        job.failed_items = 0
+        job.save(
+            update_fields=[
+                "status",
+                "worker",
+                "attempts",
+                "started_at",
+                "heartbeat_at",
+                "finished_at",
+                "processed",
+                "failed_items",
+            ]
+        )
+    return job
+
+
+def finish_attempt(job: Job, **fields):
+    """
+    Record the outcome of the attempt of `job`, unless it was requeued as stale in the meantime.
+    """
+    if not job.current_attempt().update(**fields):
+        logger.warning(f"Job {job} was requeued while running (attempt {job.attempts}), its outcome is dropped")
+
+
+def run_job(job: Job):
+    try:
+        result = get_handler(job.name)(job)
+    except Exception:
+        error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            # Retry later, backing off linearly with the number of attempts
+            logger.warning(f"Job {job} failed (attempt {job.attempts}/{job.max_attempts}), retrying")
+            finish_attempt(
+                job, status=Job.Status.PENDING, error=error, run_after=timezone.now() + RETRY_DELAY * job.attempts
+            )
+        else:
+            logger.error(f"Job {job} failed after {job.attempts} attempts")
+            finish_attempt(job, status=Job.Status.FAILED, error=error, finished_at=timezone.now())
+        return
+    finish_attempt(job, status=Job.Status.SUCCEEDED, result=result, finished_at=timezone.now())
+
+
+def run_next_job(worker: str) -> bool:
+    """
+    Claim and run one job. Returns False when there was nothing to run.
+    """
+    close_old_connections()
+    try:
+        job = claim_job(worker)
+        if job is None:
+            return False
+        run_job(job)
+        return True
+    finally:
+        close_old_connections()
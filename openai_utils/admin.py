@@ -0,0 +1,56 @@
+from django.contrib import admin, messages
+from django.db.models import QuerySet
+
+from openai_utils.models import LLMResponse, PromptStats
+
+
+@admin.register(LLMResponse)
+class LLMResponseAdmin(admin.ModelAdmin):
+    list_display = ("prompt_name", "model", "short_prompt", "short_output", "hits", "last_used_at", "created_at")
+    list_filter = ("prompt_name", "model")
+    search_fields = ("prompt", "output")
+    ordering = ("-last_used_at",)
+    readonly_fields = [field.name for field in LLMResponse._meta.fields]
+    actions = ["purge_prompts"]
+
+    @admin.display(description="Prompt")
+    def short_prompt(self, obj: LLMResponse):
+        return (obj.prompt[:75] + "...") if len(obj.prompt) > 75 else obj.prompt
+
+    @admin.display(description="Output")
+    def short_output(self, obj: LLMResponse):
+        return (obj.output[:75] + "...") if len(obj.output) > 75 else obj.output
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description="Purge every stored response of the selected prompts")
+    def purge_prompts(self, request, queryset: QuerySet[LLMResponse]):
+        prompt_names = set(queryset.values_list("prompt_name", flat=True))
+        deleted, _ = LLMResponse.objects.filter(prompt_name__in=prompt_names).delete()
+        self.message_user(
+            request,
+            f"Purged {deleted} responses of {', '.join(sorted(prompt_names)) or 'unnamed prompts'}.",
+            messages.INFO,
+        )
+
+
+@admin.register(PromptStats)
+class PromptStatsAdmin(admin.ModelAdmin):
+    list_display = ("prompt_name", "hits", "misses", "hit_rate")
+    ordering = ("prompt_name",)
+    readonly_fields = ["prompt_name", "hits", "misses"]
+    actions = ["reset_counters"]
+
+    @admin.display(description="Hit rate")
+    def hit_rate(self, obj: PromptStats):
+        total = obj.hits + obj.misses
+        return f"{obj.hits / total:.0%}" if total else "-"
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description="Reset counters")
+    def reset_counters(self, request, queryset: QuerySet[PromptStats]):
+        updated = queryset.update(hits=0, misses=0)
+        self.message_user(request, f"Reset the counters of {updated} prompts.", messages.INFO)
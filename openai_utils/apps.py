@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class OpenaiUtilsConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "openai_utils"
+    verbose_name = "OpenAI"
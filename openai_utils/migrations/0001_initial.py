@@ -0,0 +1,71 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:03
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="PromptStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("prompt_name", models.CharField(max_length=50, unique=True)),
+                ("hits", models.PositiveIntegerField(default=0)),
+                ("misses", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name_plural": "prompt stats",
+            },
+        ),
+        migrations.CreateModel(
+            name="LLMResponse",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("model", models.CharField(max_length=50)),
+                ("instructions_hash", models.CharField(max_length=64)),
+                ("prompt_hash", models.CharField(max_length=64)),
+                (
+                    "prompt_name",
+                    models.CharField(blank=True, db_index=True, max_length=50),
+                ),
+                ("prompt", models.TextField()),
+                ("output", models.TextField()),
+                ("hits", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "last_used_at",
+                    models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+                ),
+            ],
+            options={
+                "verbose_name": "LLM response",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("model", "instructions_hash", "prompt_hash"),
+                        name="unique_llm_response",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+from django.db import models
+from django.utils import timezone
+
+
+class LLMResponse(models.Model):
+    """
+    Stored LLM output, shared by every worker and kept across restarts.
+    Keyed on the model and the hashes of the instructions and the prompt, so models never share answers.
+    """
+
+    model = models.CharField(max_length=50)
+    instructions_hash = models.CharField(max_length=64)
+    prompt_hash = models.CharField(max_length=64)
+    prompt_name = models.CharField(max_length=50, blank=True, db_index=True)
+    prompt = models.TextField()
+    output = models.TextField()
+    hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["model", "instructions_hash", "prompt_hash"], name="unique_llm_response")
+        ]
+        verbose_name = "LLM response"
+
+    def __str__(self):
+        return f"{self.prompt_name or 'prompt'} ({self.model})"
+
+
+class PromptStats(models.Model):
+    """
+    Hit/miss counters of the LLM response store per prompt name.
+    """
+
+    prompt_name = models.CharField(max_length=50, unique=True)
+    hits = models.PositiveIntegerField(default=0)
+    misses = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = "prompt stats"
+
+    def __str__(self):
+        return self.prompt_name
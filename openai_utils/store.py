@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from openai_utils.models import LLMResponse, PromptStats
+from openai_utils.utils import hash_text
+
+
+def _count(prompt_name: str, field: str):
+    PromptStats.objects.bulk_create([PromptStats(prompt_name=prompt_name)], ignore_conflicts=True)
+    PromptStats.objects.filter(prompt_name=prompt_name).update(**{field: F(field) + 1})
+
+
+def get_response(model: str, instructions: str, prompt: str, prompt_name: str = "") -> str | None:
+    key = {"model": model, "instructions_hash": hash_text(instructions), "prompt_hash": hash_text(prompt)}
+    output = LLMResponse.objects.filter(**key).values_list("output", flat=True).first()
+    if output is None:
+        _count(prompt_name, "misses")
+        return None
+    LLMResponse.objects.filter(**key).update(hits=F("hits") + 1, last_used_at=timezone.now())
+    _count(prompt_name, "hits")
+    return output
+
+
+def store_response(model: str, instructions: str, prompt: str, output: str, prompt_name: str = ""):
+    LLMResponse.objects.update_or_create(
+        model=model,
+        instructions_hash=hash_text(instructions),
+        prompt_hash=hash_text(prompt),
+        defaults={"prompt_name": prompt_name, "prompt": prompt, "output": output, "last_used_at": timezone.now()},
+    )
+    evict_least_recently_used()
+
+
+def evict_least_recently_used(max_entries: int | None = None) -> int:
+    """
+    Delete the least recently used responses beyond `max_entries` (LLM_RESPONSE_STORE_MAX_ENTRIES by default).
+    Returns the number of deleted responses.
+    """
+    max_entries = settings.LLM_RESPONSE_STORE_MAX_ENTRIES if max_entries is None else max_entries
+    cutoff = LLMResponse.objects.order_by("-last_used_at", "-id").values_list("last_used_at", "id")[
+        max_entries : max_entries + 1
+    ]
+    if not cutoff:
+        return 0
+    last_used_at, response_id = cutoff[0]
+    deleted, _ = (
+        LLMResponse.objects.filter(last_used_at__lte=last_used_at)
+        .exclude(last_used_at=last_used_at, id__gt=response_id)
+        .delete()
+    )
+    return deleted
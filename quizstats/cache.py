@@ -0,0 +1,129 @@
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+
+
+def _version_key(name: str) -> str:
+    return f"version:{name}"
+
+
+def get_version(name: str) -> str:
+    """
+    Current token of a named data version.
+    Tokens are random rather than counters, so a version evicted from the cache can never come back
+    with a value that was already handed out.
+    """
+    key = _version_key(name)
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key, version)
+    return version
+
+
+def bump_version(name: str) -> str:
+    version = uuid.uuid4().hex
+    cache.set(_version_key(name), version, timeout=None)
+    return version
+
+
+STATS_VERSION = "stats"
+# The stats of every user at once, e.g. the category leaderboard
+LEADERBOARD_VERSION = "leaderboard"
+QUIZ_CONTENT_VERSION = "quiz_content"
+CATALOG_VERSION = "catalog"
+# Bumped by the rollup writers the delta refresh of the answer matrices can miss, to force a full reload
+ANSWER_MATRIX_VERSION = "answer_matrix"
+RESPONSE_TIMEOUT = 24 * 60 * 60  # 1 day
+LOCK_TIMEOUT = 30  # seconds
+LOCK_POLL_INTERVAL = 0.05  # seconds
+
+
+def bump_version_on_commit(*names: str):
+    """
+    Bump the given versions once the current transaction commits.
+    Bumping earlier would let a concurrent request cache pre-commit data under the new version.
+    """
+
+    def bump():
+        for name in names:
+            bump_version(name)
+
+    transaction.on_commit(bump)
+
+
+def quiz_content_version(quiz_id: int) -> str:
+    """
+    Name of the content version of one quiz: its parts, topics, questions and their categories.
+    Category names are covered by CATALOG_VERSION instead, as renaming one changes every quiz.
+    """
+    return f"{QUIZ_CONTENT_VERSION}:{quiz_id}"
+
+
+def bump_quiz_content_versions(quiz_ids):
+    bump_version_on_commit(*(quiz_content_version(quiz_id) for quiz_id in set(quiz_ids)))
+
+
+def bump_stats_version():
+    """
+    Invalidate every cached stats response, for changes that are not the answers of some users: the catalog,
+    the questions of a quiz, a rebuild of every rollup.
+    """
+    bump_version_on_commit(STATS_VERSION)
+
+
+def stats_version(subject: str) -> str:
+    """
+    Name of the stats version of one subject, "user:<id>" or "team:<id>", bumped by the answers of its users.
+    """
+    return f"{STATS_VERSION}:{subject}"
+
+
+def bump_user_stats_versions(user_ids):
+    """
+    Invalidate the cached stats the answers of the given users show up in: their own, their teams' and the
+    leaderboards.
+    """
+    user_ids = set(user_ids)
+    if not user_ids:
+        return
+    memberships = get_user_model().groups.through.objects.filter(user_id__in=user_ids)
+    team_ids = set(memberships.values_list("group_id", flat=True))
+    subjects = [f"user:{user_id}" for user_id in user_ids] + [f"team:{team_id}" for team_id in team_ids]
+    bump_version_on_commit(LEADERBOARD_VERSION, *(stats_version(subject) for subject in subjects))
+
+
+def cached_response(endpoint: str, subject: str, compute, versions=(), timeout: int = RESPONSE_TIMEOUT):
+    """
+    Return the cached response data of `endpoint` for `subject` (e.g. "user:3"), computing it on a miss.
+    Keys embed the global stats version and the given `versions`, those of the data the response is computed from,
+    so data writes invalidate them without deleting anything.
+    On concurrent misses only the request holding the lock computes; the others wait for its result,
+    falling back to computing themselves if it does not show up within the lock timeout.
+    """
+    version = "-".join(get_version(name) for name in (STATS_VERSION, *versions))
+    key = f"response:{endpoint}:{version}:{subject}"
+    data = cache.get(key)
+    if data is not None:
+        return data
+
+    lock_key = f"{key}:lock"
+    if cache.add(lock_key, 1, timeout=LOCK_TIMEOUT):
+        try:
+            data = compute()
+            cache.set(key, data, timeout)
+        finally:
+            cache.delete(lock_key)
+        return data
+
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        data = cache.get(key)
+        if data is not None:
+            return data
+    return compute()
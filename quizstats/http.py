@@ -0,0 +1,65 @@
+import re
+
+from django.core.files import File
+from django.http import FileResponse, HttpRequest, HttpResponse
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeReader:
+    """
+    Read-only view of the `length` bytes of a file from its current position.
+    """
+
+    def __init__(self, file, length: int):
+        self.file = file
+        self.remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if self.remaining <= 0:
+            return b""
+        size = self.remaining if size < 0 else min(size, self.remaining)
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def ranged_file_response(request: HttpRequest, file: File, filename: str, content_type: str) -> HttpResponse:
+    """
+    Stream a stored file as an attachment, honouring a single `Range: bytes=` request with a 206 response,
+    so interrupted downloads can resume. Multiple ranges are not supported and get the whole file.
+    """
+    size = file.size
+    match = RANGE_PATTERN.match(request.headers.get("Range", "").strip())
+    if not match or match.groups() == ("", ""):
+        response = FileResponse(file.open("rb"), as_attachment=True, filename=filename, content_type=content_type)
+        response["Accept-Ranges"] = "bytes"
+        return response
+
+    first, last = match.groups()
+    if first:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    else:
+        # Suffix range: the last N bytes
+        start, end = max(size - int(last), 0), size - 1
+    if start > end:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+
+    handle = file.open("rb")
+    handle.seek(start)
+    response = FileResponse(
+        RangeReader(handle, end - start + 1),
+        status=206,
+        as_attachment=True,
+        filename=filename,
+        content_type=content_type,
+    )
+    response["Accept-Ranges"] = "bytes"
+    response["Content-Length"] = str(end - start + 1)
+    response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return response
@@ -52,6 +52,8 @@ INSTALLED_APPS = [
     "corsheaders",
     # own apps
     "answers",
+    "jobs",
+    "openai_utils",
     "quizzes",
     "teams",
     "users",
@@ -112,12 +114,22 @@ DATABASES = {
     }
 }
 
+# Shared by all workers, so entries maintained on writes (e.g. unanswered topic pools) stay consistent.
+# Needs `python manage.py createcachetable`.
 CACHES = {
     "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "cache_table",
+        "OPTIONS": {"MAX_ENTRIES": 100_000},
     }
 }
 
+# Least recently used LLM responses beyond this are evicted from the response store
+LLM_RESPONSE_STORE_MAX_ENTRIES = 20_000
+
+# Compressed copies of the quiz pages fetched by downloadquiz, for re-imports with --offline
+QUIZ_PAGE_ARCHIVE_DIR = os.path.join(BASE_DIR, "quiz_pages")
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
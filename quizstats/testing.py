@@ -0,0 +1,45 @@
+"""
+Fixtures shared by the test modules of the apps.
+"""
+
+from django.test import override_settings
+
+from answers.models import UserAnswer
+from quizzes.models import Category, CategoryGroup, Question, Quiz, QuizPart, Topic
+from quizzes.utils import categorization_disabled
+
+# The versioned response cache in memory, so query counts only include the queries of the code under test
+local_cache = override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+
+
+def get_test_categories() -> tuple[CategoryGroup, Category, Category]:
+    """
+    The first seeded category group and two of its categories.
+    """
+    group = CategoryGroup.objects.order_by("id").first()
+    category, other_category = Category.objects.filter(group=group).order_by("id")[:2]
+    return group, category, other_category
+
+
+def create_quiz_part(season: int = 1, week: str = "1", sequence: int = 1) -> QuizPart:
+    quiz, _ = Quiz.objects.get_or_create(season=season, week=week)
+    return QuizPart.objects.create(quiz=quiz, sequence=sequence)
+
+
+def create_answered_questions(part: QuizPart, rows, topic_title: str = "Theme") -> list[Question]:
+    """
+    One question per row in a topic of `part`. A row is a category and the answers to its question,
+    a dict of users to whether they answered correctly. Answers are saved one by one, so the stats signals
+    keep the rollups up to date. The questions are not sent for categorization.
+    """
+    topic, _ = Topic.objects.get_or_create(title=topic_title, quiz_part=part)
+    start = Question.objects.filter(topic=topic).count()
+    questions = []
+    for index, (category, answers) in enumerate(rows, start=start):
+        with categorization_disabled():
+            question = Question.objects.create(topic=topic, statement=f"Question {index}", answer=f"Answer {index}")
+        question.categories.add(category)
+        for user, is_correct in answers.items():
+            UserAnswer.objects.create(user=user, question=question, is_correct=is_correct)
+        questions.append(question)
+    return questions
@@ -3,10 +3,12 @@ import json
 from django.contrib import admin, messages
 from django.db.models import Count, QuerySet
 from django.http import HttpResponse
+from django.urls import reverse
+from django.utils.html import format_html
 
 from answers.models import UserAnswer
+from jobs.registry import enqueue
 from quizzes.models import Category, CategoryGroup, Question, Quiz, QuizPart, Topic
-from quizzes.utils import categorize_question
 
 
 class HasCategoryFilter(admin.SimpleListFilter):
@@ -121,15 +123,13 @@ class QuestionAdmin(admin.ModelAdmin):
 
     @admin.action(description="Re-categorize selected questions")
     def re_categorize_questions(self, request, queryset: QuerySet[Question]):
-        total = queryset.count()
-        updated = 0
-
-        for question in queryset:
-            old_categories = set(question.categories.all())
-            categorize_question(question)
-            if set(question.categories.all()) != old_categories:
-                updated += 1
-
+        question_ids = list(queryset.order_by("id").values_list("id", flat=True))
+        job = enqueue("categorize_questions", {"question_ids": question_ids}, total=len(question_ids))
+        job_url = reverse("admin:jobs_job_change", args=[job.pk])
         self.message_user(
-            request, f"Processed {total} questions. {updated} questions had updated categories.", messages.INFO
+            request,
+            format_html(
+                'Queued {} questions for categorization: <a href="{}">{}</a>.', len(question_ids), job_url, job
+            ),
+            messages.INFO,
         )
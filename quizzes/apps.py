@@ -6,4 +6,5 @@ class QuizzesConfig(AppConfig):
     name = "quizzes"
 
     def ready(self):
+        import quizzes.jobs  # noqa
         import quizzes.signals  # noqa
@@ -0,0 +1,95 @@
+import hashlib
+import unicodedata
+
+from django.db.models import Count, Max, Min
+
+
+def normalize_content(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+def get_content_hash(topic_title: str, statement: str, answer: str) -> str:
+    """
+    Hash identifying a question within its quiz part, insensitive to case, Unicode forms and whitespace.
+    """
+    content = "\x1f".join(normalize_content(text) for text in (topic_title, statement, answer))
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def merge_duplicate_questions(question_model, topic_model, answer_model) -> tuple[int, set[int]]:
+    """
+    Merge the questions and topics imported more than once into the oldest copy.
+    Questions of a part with the same content hash (refreshed for every question first) become one: their categories
+    are combined and their answers re-pointed, keeping the most recently updated answer when a user answered several
+    copies. Then topics of a part with the same title become one.
+    Takes the models as arguments so the migration adding the content hash can run it with its historical models.
+    Returns the number of questions merged away and the ids of the users whose stats the merge changed.
+    """
+    outdated = []
+    for question_id, topic_title, statement, answer, content_hash in question_model.objects.values_list(
+        "id", "topic__title", "statement", "answer", "content_hash"
+    ).iterator(chunk_size=2000):
+        fresh_hash = get_content_hash(topic_title, statement, answer)
+        if fresh_hash != content_hash:
+            outdated.append(question_model(id=question_id, content_hash=fresh_hash))
+    question_model.objects.bulk_update(outdated, ["content_hash"], batch_size=1000)
+
+    through_model = question_model.categories.through
+    # The hash covers the topic title, so copies in duplicate topics of a part are found too
+    duplicate_questions = (
+        question_model.objects.values("topic__quiz_part_id", "content_hash")
+        .annotate(count=Count("id"), keep_id=Min("id"))
+        .filter(count__gt=1)
+    )
+    merged = 0
+    user_ids = set()
+    for row in duplicate_questions:
+        keep = question_model.objects.get(id=row["keep_id"])
+        duplicates = question_model.objects.filter(
+            topic__quiz_part_id=row["topic__quiz_part_id"], content_hash=row["content_hash"]
+        ).exclude(id=keep.pk)
+        duplicate_ids = list(duplicates.values_list("id", flat=True))
+
+        kept_answers = {answer.user_id: answer for answer in answer_model.objects.filter(question_id=keep.pk)}
+        for answer in answer_model.objects.filter(question_id__in=duplicate_ids).order_by("updated_at"):
+            user_ids.add(answer.user_id)
+            kept = kept_answers.get(answer.user_id)
+            if kept is None:
+                answer_model.objects.filter(pk=answer.pk).update(question_id=keep.pk)
+                kept_answers[answer.user_id] = answer
+            elif answer.updated_at > kept.updated_at:
+                answer_model.objects.filter(pk=kept.pk).update(
+                    is_correct=answer.is_correct, updated_at=answer.updated_at
+                )
+                kept.updated_at = answer.updated_at
+
+        category_ids = set(
+            through_model.objects.filter(question_id__in=duplicate_ids).values_list("category_id", flat=True)
+        )
+        # Categories gained by the kept question change the stats of everyone who answered it
+        user_ids.update(kept_answers)
+        through_model.objects.bulk_create(
+            [through_model(question_id=keep.pk, category_id=category_id) for category_id in category_ids],
+            ignore_conflicts=True,
+        )
+        if keep.categorized_at is None:
+            categorized_at = duplicates.aggregate(latest=Max("categorized_at"))["latest"]
+            if categorized_at is not None:
+                question_model.objects.filter(pk=keep.pk).update(categorized_at=categorized_at)
+
+        # The answers left on the copies were folded into the kept question's and go with them
+        duplicates.delete()
+        merged += len(duplicate_ids)
+
+    duplicate_topics = (
+        topic_model.objects.values("quiz_part_id", "title")
+        .annotate(count=Count("id"), keep_id=Min("id"))
+        .filter(count__gt=1)
+    )
+    for row in duplicate_topics:
+        duplicates = topic_model.objects.filter(quiz_part_id=row["quiz_part_id"], title=row["title"]).exclude(
+            id=row["keep_id"]
+        )
+        question_model.objects.filter(topic__in=duplicates).update(topic_id=row["keep_id"])
+        duplicates.delete()
+    return merged, user_ids
@@ -0,0 +1,29 @@
+from jobs.models import Job
+from jobs.registry import register
+from quizzes.models import Question
+from quizzes.utils import CATEGORIZATION_BATCH_SIZE, categorize_questions
+
+
+def _category_sets(question_ids) -> dict[int, set[int]]:
+    category_sets = {question_id: set() for question_id in question_ids}
+    links = Question.categories.through.objects.filter(question_id__in=question_ids)
+    for question_id, category_id in links.values_list("question_id", "category_id"):
+        category_sets[question_id].add(category_id)
+    return category_sets
+
+
+@register("categorize_questions")
+def categorize_questions_job(job: Job):
+    """
+    Re-categorize the questions in `payload["question_ids"]`, one LLM batch at a time.
+    """
+    question_ids = job.payload["question_ids"]
+    updated = 0
+    for start in range(0, len(question_ids), CATEGORIZATION_BATCH_SIZE):
+        batch_ids = question_ids[start : start + CATEGORIZATION_BATCH_SIZE]
+        before = _category_sets(batch_ids)
+        categorized = categorize_questions(batch_ids)
+        after = _category_sets(batch_ids)
+        updated += sum(before[question_id] != after[question_id] for question_id in batch_ids)
+        job.report_progress(processed=categorized, failed=len(batch_ids) - categorized)
+    return {"updated": updated}
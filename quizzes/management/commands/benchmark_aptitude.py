@@ -0,0 +1,53 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from quizzes.stats import weighted_quantiles
+
+
+def expanded_medians(accuracy: np.ndarray, weights: np.ndarray) -> list[float]:
+    """The previous AptitudeView approach: repeat each accuracy `weight` times, then take the median."""
+    medians = []
+    for user_accuracy in accuracy:
+        weighted_scores = []
+        for value, weight in zip(user_accuracy, weights):
+            weighted_scores.extend([value] * weight)
+        weighted_scores.sort()
+        medians.append(float(np.median(weighted_scores)))
+    return medians
+
+
+class Command(BaseCommand):
+    help = "Benchmark the weighted median used by the order-of-play predictor against list expansion"
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, nargs="+", default=[10, 100, 500])
+        parser.add_argument("--categories", type=int, default=50)
+        parser.add_argument("--max-weights", type=int, nargs="+", default=[3, 100, 1000])
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options["seed"])
+        n_categories = options["categories"]
+        self.stdout.write(
+            f"{'users':>6} {'max weight':>10} {'expanded (ms)':>14} {'weighted (ms)':>14} {'max diff':>10}"
+        )
+        for n_users in options["users"]:
+            for max_weight in options["max_weights"]:
+                accuracy = rng.random((n_users, n_categories))
+                weights = rng.integers(1, max_weight + 1, n_categories)
+
+                start = time.perf_counter()
+                expected = expanded_medians(accuracy, weights)
+                expanded_ms = (time.perf_counter() - start) * 1000
+
+                start = time.perf_counter()
+                medians = weighted_quantiles(accuracy, weights, [0.5])[:, 0]
+                weighted_ms = (time.perf_counter() - start) * 1000
+
+                max_diff = float(np.max(np.abs(medians - expected)))
+                self.stdout.write(
+                    f"{n_users:>6} {max_weight:>10} {expanded_ms:>14.2f} {weighted_ms:>14.2f} {max_diff:>10.1e}"
+                )
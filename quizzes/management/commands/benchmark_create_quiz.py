@@ -0,0 +1,98 @@
+import time
+from contextlib import redirect_stdout
+from difflib import get_close_matches
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from answers.models import UserAnswer
+from quizzes.management.commands.utils.data_creation import create_quiz, is_similar
+from quizzes.management.commands.utils.parser import build_quiz_data
+from quizzes.management.commands.utils.timing import QueryCounter
+from quizzes.models import Question, Quiz, QuizPart, Topic
+from quizzes.utils import categorization_disabled
+
+User = get_user_model()
+
+DEFAULT_PAGES = Path(__file__).resolve().parent / "data" / "synthetic_pages"
+
+
+def legacy_get_user(player_name: str):
+    full_name_map = {f"{u.first_name} {u.last_name}".strip(): u for u in User.objects.all()}
+    match = get_close_matches(player_name, list(full_name_map.keys()), n=1, cutoff=0.7)
+    if match:
+        return full_name_map[match[0]]
+
+
+def legacy_create_quiz(quiz_data: dict):
+    """
+    The previous persistence, kept as the baseline: one query per row and a user lookup per answer, made idempotent
+    with get_or_create and update_or_create like the upserts it is compared with.
+    """
+    quiz, _ = Quiz.objects.get_or_create(season=quiz_data["season"], week=quiz_data["week"])
+    for part_data in quiz_data.get("parts", []):
+        part, _ = QuizPart.objects.get_or_create(quiz=quiz, sequence=part_data["sequence"])
+        for question_data in part_data.get("questions", []):
+            topic, _ = Topic.objects.get_or_create(title=question_data["theme"], quiz_part=part)
+            question, _ = Question.objects.get_or_create(
+                topic=topic,
+                statement=question_data["question"],
+                answer=question_data["answer"],
+                defaults={"is_box": topic.title.startswith("Mystery Box")},
+            )
+            if not is_similar(question_data["team"], "José Figueiras"):
+                continue
+            if question_data["player"] == "Equipa":
+                continue
+            user = legacy_get_user(question_data["player"])
+            if user:
+                UserAnswer.objects.update_or_create(
+                    user=user, question=question, defaults={"is_correct": bool(question_data["guessed"])}
+                )
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark create_quiz against the previous row-by-row persistence on a full season built from "
+        "synthetic pages. Runs inside a transaction that is rolled back at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pages", type=Path, default=DEFAULT_PAGES, help="Directory of quiz pages")
+        parser.add_argument("--weeks", type=int, default=30, help="Number of quizzes in the season")
+
+    def handle(self, *args, **options):
+        pages = [path.read_text(encoding="utf-8") for path in sorted(options["pages"].glob("*.html"))]
+        season = []
+        for week in range(options["weeks"]):
+            quiz_data = build_quiz_data(f"QNpt9000_{week + 1}", pages[week % len(pages)])
+            season.append(quiz_data)
+        questions = sum(len(part["questions"]) for quiz_data in season for part in quiz_data["parts"])
+        self.stdout.write(f"Season of {len(season)} quizzes and {questions} questions")
+
+        with transaction.atomic(), categorization_disabled():
+            self.create_players(season)
+            for label, func in [("row by row", legacy_create_quiz), ("bulk", create_quiz)]:
+                queries = QueryCounter()
+                with transaction.atomic(), connection.execute_wrapper(queries), redirect_stdout(StringIO()):
+                    start = time.perf_counter()
+                    for quiz_data in season:
+                        func(quiz_data)
+                    elapsed = time.perf_counter() - start
+                    answers = UserAnswer.objects.filter(question__topic__quiz_part__quiz__season=9000).count()
+                    transaction.set_rollback(True)
+                self.stdout.write(
+                    f"{label:>10}: {elapsed:7.2f} s, {queries.count:6d} queries "
+                    f"({queries.count / len(season):.0f} per quiz), {answers} answers"
+                )
+            transaction.set_rollback(True)
+
+    def create_players(self, season: list[dict]):
+        players = {row["player"] for quiz_data in season for part in quiz_data["parts"] for row in part["questions"]}
+        for player in players - {"Equipa"}:
+            first_name, _, last_name = player.partition(" ")
+            if not User.objects.filter(first_name=first_name, last_name=last_name).exists():
+                User.objects.create(username=f"benchmark-{player}", first_name=first_name, last_name=last_name)
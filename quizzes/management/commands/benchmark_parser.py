@@ -0,0 +1,119 @@
+import re
+import time
+from pathlib import Path
+
+import numpy as np
+from bs4 import BeautifulSoup
+from django.core.management.base import BaseCommand
+
+from quizzes.management.commands.utils.html import HTML_PARSER, extract_quiz_data, find_jf_game, parse_html
+
+DEFAULT_PAGES = Path(__file__).resolve().parent / "data" / "synthetic_pages"
+
+
+def legacy_extract_quiz_data(soup: BeautifulSoup) -> list[list[dict]]:
+    """
+    The previous row extraction, kept as the baseline: three BeautifulSoup parses per row.
+    """
+    whole_json = find_jf_game(soup)
+    if not whole_json:
+        return []
+    try:
+        quiz_data = whole_json["x"]["data"]
+    except KeyError:
+        return []
+
+    parsed_data = []
+    for part in quiz_data:
+        part_data = []
+        if "text" not in part:
+            continue
+        for row in part["text"]:
+            soup_text = BeautifulSoup(row, "html.parser")
+            parts = re.split(r"<br\s*/>", str(soup_text))
+            if len(parts) < 2:
+                continue
+            player_tag = parts[0].strip()
+            player_soup = BeautifulSoup(player_tag, "html.parser")
+            b_tag = player_soup.find("b")
+            if b_tag:
+                full_name_and_team = b_tag.get_text(strip=True)
+                player_name = full_name_and_team.split(" - ")[0]
+                team_name = full_name_and_team.split(" - ")[1]
+            final_part = parts[-1].strip()
+            final_soup = BeautifulSoup(final_part, "html.parser")
+            points_tag = final_soup.find("b")
+
+            if points_tag:
+                points = points_tag.get_text(strip=True)
+            theme_xt_xp = parts[1].strip()
+            pattern = re.compile(r"^(.*?)\s*\(xT\s*=\s*([\d.]+),\s*xP\s*=\s*([\d.]+)\)")
+            match = pattern.search(theme_xt_xp)
+            if match:
+                theme = match.group(1).strip()
+                theme = re.sub(r"^Parte\s\d\s", "", theme).strip()
+                xt = float(match.group(2))
+                xp = float(match.group(3))
+            else:
+                continue
+            for br in soup_text.find_all("br"):
+                br.replace_with(" ")
+            question_tag = soup_text.find("i")
+            question = question_tag.get_text() if question_tag else ""
+            answer_tag = soup_text.find("b", string="Resposta")
+            answer = answer_tag.find_next("i").get_text() if answer_tag else ""
+            part_data.append(
+                {
+                    "theme": theme,
+                    "xT": xt,
+                    "xP": xp,
+                    "question": question,
+                    "answer": answer,
+                    "player": player_name,
+                    "team": team_name,
+                    "guessed": points == "2",
+                }
+            )
+        parsed_data.append(part_data)
+    return parsed_data
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the quiz page parser against the legacy one on a corpus of synthetic pages, "
+        "checking identical output"
+    )
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pages", type=Path, default=DEFAULT_PAGES, help="Directory of quiz pages")
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        pages = {path.name: path.read_text(encoding="utf-8") for path in sorted(options["pages"].glob("*.html"))}
+        self.stdout.write(f"{len(pages)} pages, page parser: {HTML_PARSER}")
+
+        mismatches = 0
+        legacy_timings, new_timings = [], []
+        for name, html in pages.items():
+            legacy_result = new_result = None
+            for _ in range(options["repeat"]):
+                start = time.perf_counter()
+                legacy_result = legacy_extract_quiz_data(BeautifulSoup(html, "html.parser"))
+                legacy_timings.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                new_result = extract_quiz_data(parse_html(html))
+                new_timings.append(time.perf_counter() - start)
+            if new_result != legacy_result:
+                mismatches += 1
+                self.stderr.write(f"{name}: the parsers disagree!")
+            else:
+                rows = sum(len(part) for part in new_result)
+                self.stdout.write(f"{name}: {rows} questions, identical output")
+
+        legacy, new = np.median(legacy_timings) * 1000, np.median(new_timings) * 1000
+        self.stdout.write(f"Median per page: legacy {legacy:.2f} ms, new {new:.2f} ms ({legacy / new:.1f}x faster)")
+        if mismatches:
+            self.stderr.write(f"{mismatches} pages with different output")
+        else:
+            self.stdout.write(self.style.SUCCESS("All pages parsed identically."))
@@ -0,0 +1,77 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+
+from quizzes.duplicates import get_content_hash
+from quizzes.models import Category, Question, Quiz, QuizPart, Topic
+from quizzes.serializers import QuizSerializer
+from quizzes.snapshots import get_quiz_document, render_quiz_document
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the quiz endpoint payload: nested serialization against pre-rendered snapshots. "
+        "Works on a synthetic quiz inside a transaction that is rolled back at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--questions", type=int, default=60)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            quiz = self.create_quiz(options["questions"])
+            get_quiz_document(quiz.pk)
+            documents = [
+                self.report("nested serializer", options["repeat"], lambda: self.serialize(quiz.pk)),
+                self.report("prefetched render", options["repeat"], lambda: render_quiz_document(quiz.pk)),
+                self.report("snapshot", options["repeat"], lambda: get_quiz_document(quiz.pk)),
+            ]
+            if any(document != documents[0] for document in documents):
+                self.stderr.write("The documents differ!")
+            transaction.set_rollback(True)
+
+    def create_quiz(self, n_questions: int):
+        # bulk_create skips the signals, so no categorization requests are sent
+        quiz = Quiz.objects.create(season=9000, week="1")
+        parts = QuizPart.objects.bulk_create(QuizPart(quiz=quiz, sequence=i + 1) for i in range(2))
+        topics = Topic.objects.bulk_create(
+            Topic(title=f"Topic {i}", quiz_part=parts[i % 2]) for i in range(max(n_questions // 5, 1))
+        )
+        questions = []
+        for i in range(n_questions):
+            topic = topics[i // 5 % len(topics)]
+            questions.append(
+                Question(
+                    topic=topic, statement=f"Q{i}", answer="A", content_hash=get_content_hash(topic.title, f"Q{i}", "A")
+                )
+            )
+        Question.objects.bulk_create(questions)
+        category_ids = list(Category.objects.values_list("id", flat=True)[:10])
+        if category_ids:
+            Question.categories.through.objects.bulk_create(
+                Question.categories.through(question_id=question.pk, category_id=category_ids[i % len(category_ids)])
+                for i, question in enumerate(questions)
+            )
+        return quiz
+
+    def serialize(self, quiz_id: int):
+        # What QuizView used to do: no prefetching, one query per nested relation
+        return JSONRenderer().render(QuizSerializer(Quiz.objects.get(pk=quiz_id)).data).decode()
+
+    def report(self, label: str, repeat: int, func):
+        timings = []
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                result = func()
+                timings.append((time.perf_counter() - start) * 1000)
+        self.stdout.write(
+            f"{label:>18}: median {np.median(timings):8.2f} ms, min {min(timings):8.2f} ms, "
+            f"{len(queries)} queries, {len(result)} bytes"
+        )
+        return result
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from quizzes.models import Question
+from quizzes.utils import CATEGORIZATION_BATCH_SIZE, categorize_questions
+
+
+class Command(BaseCommand):
+    help = "Categorize the questions that were never categorized, e.g. after an import with --skip-categorization"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=CATEGORIZATION_BATCH_SIZE, help="Questions per prompt")
+        parser.add_argument("--limit", type=int, help="Categorize at most this many questions")
+
+    def handle(self, *args, **options):
+        question_ids = Question.objects.filter(categorized_at__isnull=True).order_by("id").values_list("id", flat=True)
+        if options["limit"]:
+            question_ids = question_ids[: options["limit"]]
+        question_ids = list(question_ids)
+        self.stdout.write(f"Categorizing {len(question_ids)} pending questions...")
+        categorized = categorize_questions(question_ids, batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Categorized {categorized} questions."))
@@ -1,10 +1,21 @@
+import multiprocessing
+import time
 import traceback
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
 
+import requests
 from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
 
+from quizzes.management.commands.utils.archive import PageNotArchived
 from quizzes.management.commands.utils.data_creation import create_quiz
-from quizzes.management.commands.utils.html import HtmlException
-from quizzes.management.commands.utils.parser import get_quiz_data
+from quizzes.management.commands.utils.parser import extract_season_week, get_quiz_data
+from quizzes.management.commands.utils.timing import QueryCounter, StageTimings
+from quizzes.models import Quiz
+from quizzes.utils import categorization_disabled
+from users.players import PlayerNameResolver
 
 
 class Command(BaseCommand):
@@ -13,6 +24,33 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument("--file", type=str, help="Path to a text file containing one URL per line")
         parser.add_argument("--url", action="append", help="One or more URLs to process (can be repeated)")
+        parser.add_argument(
+            "--skip-categorization",
+            action="store_true",
+            help="Do not categorize the new questions; run the categorize_pending command later",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Roll back every import and report the number of queries it ran instead",
+        )
+        parser.add_argument(
+            "--offline",
+            action="store_true",
+            help="Import the pages archived by previous runs instead of fetching them",
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Skip the URLs whose season and week are already imported, before fetching them",
+        )
+        parser.add_argument("--concurrency", type=int, default=1, help="Number of pages fetched and parsed in parallel")
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=0,
+            help="Worker processes parsing the fetched pages across cores; 0 parses in the fetching threads",
+        )
 
     def handle(self, *args, **options):
         urls = []
@@ -32,14 +70,88 @@ class Command(BaseCommand):
         else:
             raise CommandError("You must provide either --file or --url.")
 
+        if options["incremental"]:
+            urls = self.exclude_imported(urls)
+
+        timings = StageTimings()
+        resolver = PlayerNameResolver()
+        started = time.perf_counter()
+        processes = max(options["processes"], 0)
+        # A fetching thread waits for the parse of its page, so there are enough threads to keep every process busy
+        concurrency = max(options["concurrency"], processes, 1)
+        # spawn, not fork: the pool starts from the fetching threads, and forking a threaded process can deadlock
+        parse_pool = (
+            ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"))
+            if processes
+            else nullcontext()
+        )
+        # Fetching and parsing run in the pools; this thread is the only one writing to the database
+        with parse_pool as parse_executor, ThreadPoolExecutor(max_workers=concurrency) as executor:
+            remaining = iter(urls)
+            in_flight = deque()
+
+            def submit_next():
+                url = next(remaining, None)
+                if url is not None:
+                    future = executor.submit(get_quiz_data, url, timings, options["offline"], parse_executor)
+                    in_flight.append((url, future))
+
+            # Bounded read-ahead, so parsed quizzes do not pile up in memory while the writer catches up
+            for _ in range(concurrency * 2):
+                submit_next()
+            while in_flight:
+                url, future = in_flight.popleft()
+                submit_next()
+                try:
+                    self.stdout.write(f"Processing: {url}")
+                    quiz_data = future.result()
+                    with timings.stage("db"):
+                        self.save_quiz(quiz_data, options, resolver)
+                except requests.RequestException as e:
+                    self.stderr.write(f"Error fetching page {url}: {e}")
+                except PageNotArchived as e:
+                    self.stderr.write(f"{e}; run without --offline to fetch it")
+                except Exception as e:
+                    self.stderr.write(traceback.format_exc())
+                    self.stderr.write(f"Error processing {url}: {e}")
+
+        self.stdout.write(f"Processed {len(urls)} URLs in {time.perf_counter() - started:.2f} s:")
+        for line in timings.report():
+            self.stdout.write(line)
+        unmatched = resolver.report_unmatched()
+        if unmatched:
+            self.stdout.write(
+                self.style.WARNING(f"Dropped the answers of {len(unmatched)} unmatched players; add a player alias:")
+            )
+            for line in unmatched:
+                self.stdout.write(f"  {line}")
+        self.stdout.write(self.style.SUCCESS("Quiz import complete!"))
+
+    def exclude_imported(self, urls: list[str]) -> list[str]:
+        imported = set(Quiz.objects.filter(total_questions__gt=0).values_list("season", "week"))
+        pending = []
         for url in urls:
             try:
-                self.stdout.write(f"Processing: {url}")
-                quiz_data = get_quiz_data(url)
-                create_quiz(quiz_data)
-            except HtmlException as e:
-                self.stderr.write(f"Error fetching page {url}: {e}")
-            except Exception as e:
-                self.stderr.write(traceback.format_exc())
-                self.stderr.write(f"Error processing {url}: {e}")
-        self.stdout.write(self.style.SUCCESS("Quiz import complete!"))
+                season_week = extract_season_week(url)
+            except ValueError:
+                pending.append(url)  # Reported by the import
+                continue
+            if season_week not in imported:
+                pending.append(url)
+        self.stdout.write(f"Skipping {len(urls) - len(pending)} quizzes already imported.")
+        return pending
+
+    def save_quiz(self, quiz_data: dict, options: dict, resolver: PlayerNameResolver):
+        if not options["dry_run"]:
+            if options["skip_categorization"]:
+                with categorization_disabled():
+                    create_quiz(quiz_data, resolver)
+            else:
+                create_quiz(quiz_data, resolver)
+            return
+        queries = QueryCounter()
+        with transaction.atomic(), connection.execute_wrapper(queries):
+            create_quiz(quiz_data, resolver)
+            transaction.set_rollback(True)
+        questions = sum(len(part["questions"]) for part in quiz_data.get("parts", []))
+        self.stdout.write(f"Dry run: {questions} questions in {queries.count} queries, rolled back")
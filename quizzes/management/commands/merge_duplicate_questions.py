@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from answers.bitsets import invalidate_answered_bitsets
+from answers.models import UserAnswer
+from answers.utils import rebuild_category_stats, rebuild_quiz_progress
+from quizzes.duplicates import merge_duplicate_questions
+from quizzes.models import Question, Topic
+from quizzes.pools import invalidate_unanswered_topic_pools
+
+
+class Command(BaseCommand):
+    help = (
+        "Merge the questions imported more than once, e.g. by re-runs or partial failures of downloadquiz, "
+        "moving their answers and categories to the copy that is kept"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Report the duplicates and roll the merge back")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            merged, user_ids = merge_duplicate_questions(Question, Topic, UserAnswer)
+            if options["dry_run"]:
+                transaction.set_rollback(True)
+                self.stdout.write(f"Would merge {merged} questions, changing the stats of {len(user_ids)} users.")
+                return
+            if merged:
+                # Answers were moved with bulk updates, which skip the stats signals: recount the touched users
+                rebuild_category_stats(user_ids=user_ids)
+                rebuild_quiz_progress(user_ids=user_ids)
+        if merged:
+            invalidate_answered_bitsets(user_ids)
+            invalidate_unanswered_topic_pools()
+        message = f"Merged {merged} questions, changing the stats of {len(user_ids)} users."
+        self.stdout.write(self.style.SUCCESS(message))
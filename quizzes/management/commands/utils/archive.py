@@ -0,0 +1,39 @@
+import gzip
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+
+
+class PageNotArchived(LookupError):
+    pass
+
+
+def get_archive_path(url: str) -> Path:
+    return Path(settings.QUIZ_PAGE_ARCHIVE_DIR) / f"{hashlib.sha256(url.encode()).hexdigest()}.html.gz"
+
+
+def read_page(url: str) -> str:
+    """
+    The archived HTML of a URL. Raises PageNotArchived if it was never fetched.
+    """
+    try:
+        with gzip.open(get_archive_path(url), "rt", encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        raise PageNotArchived(f"Page not archived: {url}")
+
+
+def write_page(url: str, html: str):
+    """
+    Archive the HTML of a URL, compressed. The file is replaced atomically, so a concurrent reader or an
+    interrupted run never sees a truncated page.
+    """
+    path = get_archive_path(url)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as temporary_file:
+        with gzip.open(temporary_file, "wt", encoding="utf-8") as f:
+            f.write(html)
+    os.replace(temporary_file.name, path)
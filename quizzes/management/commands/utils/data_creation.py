@@ -1,70 +1,125 @@
-from difflib import SequenceMatcher, get_close_matches
-from io import BytesIO
+from difflib import SequenceMatcher
+from functools import lru_cache
 
 from answers.models import UserAnswer
-from django.contrib.auth import get_user_model
-from django.core.files.base import ContentFile
+from answers.utils import record_answer_changes
+from django.db import transaction
+from quizzes.duplicates import get_content_hash
 from quizzes.models import Question, Quiz, QuizPart, Topic
+from quizzes.utils import record_created_questions
+from users.players import PlayerNameResolver
+
+OWN_TEAM = "José Figueiras"
 
 
 def is_similar(a: str, b: str, threshold: float = 0.8) -> bool:
     return SequenceMatcher(None, a.lower(), b.lower()).ratio() >= threshold
 
 
-User = get_user_model()
-
-
-def get_user(player_name: str):
-    users = list(User.objects.all())
-    full_name_map = {f"{u.first_name} {u.last_name}".strip(): u for u in users}
-    full_names = list(full_name_map.keys())
-    match = get_close_matches(player_name, full_names, n=1, cutoff=0.7)
-    if match:
-        matched_name = match[0]
-        user = full_name_map[matched_name]
-        return user
+@lru_cache(maxsize=None)
+def is_own_team(team_name: str) -> bool:
+    return is_similar(team_name, OWN_TEAM)
 
 
-def create_quiz(quiz_data: dict):
+@transaction.atomic
+def create_quiz(quiz_data: dict, resolver: PlayerNameResolver | None = None):
+    """
+    Persist a parsed quiz in one transaction, with a number of queries that does not depend on its size:
+    players are resolved once per name and topics, questions and answers are bulk upserted, so importing
+    a quiz again only applies what changed.
+    bulk_create skips the model signals, so their side effects are applied explicitly at the end.
+    Pass the resolver of the import run to share its lookups and its report of unmatched players across quizzes.
+    """
     # Create or get Quiz
-    quiz, created = Quiz.objects.get_or_create(season=quiz_data["season"], week=quiz_data["week"])
+    quiz, created = Quiz.objects.get_or_create(
+        season=quiz_data["season"], week=quiz_data["week"], defaults={"title": quiz_data.get("title", "")}
+    )
     print(f"{'Created' if created else 'Using existing'} quiz for Season {quiz.season} Week {quiz.week}")
 
-    # Loop through parts
+    resolver = resolver or PlayerNameResolver()
+    resolver.resolve_many(
+        question_data["player"]
+        for part_data in quiz_data.get("parts", [])
+        for question_data in part_data.get("questions", [])
+        if is_own_team(question_data["team"])
+    )
+    parts = []
     for part_data in quiz_data.get("parts", []):
         part, created = QuizPart.objects.get_or_create(quiz=quiz, sequence=part_data["sequence"])
         print(f"{'  Created' if created else '  Using existing'} part {part.sequence}")
+        parts.append((part, part_data))
 
-        if created:
-            ppt = part_data.get("ppt")
-            if ppt:
-                buffer = BytesIO()
-                ppt.save(buffer)
-                buffer.seek(0)
-                filename = f"quiz_s{quiz.season}_w{quiz.week}_part{part.sequence}.pptx"
-                part.ppt_file.save(filename, ContentFile(buffer.read()))
-                part.save()
-                print(f"    Attached ppt: {filename}")
-
+    # Topics: reuse the existing ones, upsert the missing ones in one statement, in case another import added them
+    topics = {(topic.quiz_part_id, topic.title): topic for topic in Topic.objects.filter(quiz_part__quiz=quiz)}
+    new_topics = {}
+    for part, part_data in parts:
         for question_data in part_data.get("questions", []):
-            # Create Topic
-            topic, _ = Topic.objects.get_or_create(title=question_data["theme"], quiz_part=part)
+            key = (part.pk, question_data["theme"])
+            if key not in topics and key not in new_topics:
+                new_topics[key] = Topic(title=question_data["theme"], quiz_part=part)
+    for topic in Topic.objects.bulk_create(
+        new_topics.values(), update_conflicts=True, unique_fields=["quiz_part", "title"], update_fields=["title"]
+    ):
+        topics[(topic.quiz_part_id, topic.title)] = topic
 
-            # Create Question
-            question = Question.objects.create(
-                topic=topic,
-                statement=question_data["question"],
-                answer=question_data["answer"],
-                is_box=topic.title.startswith("Mystery Box"),
-            )
+    # Questions are keyed by their content hash, so a re-import updates them instead of adding copies
+    existing_ids = set(Question.objects.filter(topic__quiz_part__quiz=quiz).values_list("id", flat=True))
+    questions = {}
+    answers = {}
+    for part, part_data in parts:
+        for question_data in part_data.get("questions", []):
+            topic = topics[(part.pk, question_data["theme"])]
+            content_hash = get_content_hash(topic.title, question_data["question"], question_data["answer"])
+            question = questions.get((topic.pk, content_hash))
+            if question is None:
+                question = Question(
+                    topic=topic,
+                    statement=question_data["question"],
+                    answer=question_data["answer"],
+                    is_box=topic.title.startswith("Mystery Box"),
+                    xp=question_data.get("xP"),
+                    content_hash=content_hash,
+                )
+                questions[(topic.pk, content_hash)] = question
             team_name = question_data["team"]
-            if not is_similar(team_name, "José Figueiras"):
+            if not is_own_team(team_name):
                 continue
             player_name = question_data["player"]
             if player_name == "Equipa":  # TODO: support for team-answered questions
                 continue
-            user = get_user(player_name)
+            user = resolver.resolve(player_name)
             if user:
-                is_correct = bool(question_data["guessed"])
-                UserAnswer.objects.create(user=user, question=question, is_correct=is_correct)
-            print(f"    Added question: {question.statement[:30]}...")
+                answers[(user.pk, topic.pk, content_hash)] = (user, question, bool(question_data["guessed"]))
+        print(f"    Added {len(part_data.get('questions', []))} questions to part {part.sequence}")
+
+    Question.objects.bulk_create(
+        questions.values(),
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=["topic", "content_hash"],
+        update_fields=["is_box", "xp"],
+    )
+    previous = {
+        (user_id, question_id): is_correct
+        for user_id, question_id, is_correct in UserAnswer.objects.filter(question_id__in=existing_ids).values_list(
+            "user_id", "question_id", "is_correct"
+        )
+    }
+    changes = []
+    new_answers = []
+    for user, question, is_correct in answers.values():
+        was_correct = previous.get((user.pk, question.pk))
+        if was_correct == is_correct:
+            continue
+        new_answers.append(UserAnswer(user=user, question=question, is_correct=is_correct))
+        changes.append((user.pk, question.pk, int(was_correct is None), int(is_correct) - int(bool(was_correct))))
+    UserAnswer.objects.bulk_create(
+        new_answers,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=["user", "question"],
+        update_fields=["is_correct", "updated_at"],
+    )
+    record_created_questions(quiz, [question.pk for question in questions.values() if question.pk not in existing_ids])
+    record_answer_changes(changes)
+    return quiz
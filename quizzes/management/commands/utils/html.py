@@ -1,13 +1,67 @@
 import json
 import re
+import threading
+from html import escape
+from html.parser import HTMLParser
 
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+try:
+    import lxml  # noqa: F401
 
-def fetch_page(url):
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+FETCH_TIMEOUT = (5, 30)  # connect, read (seconds)
+
+THEME_PATTERN = re.compile(r"^(.*?)\s*\(xT\s*=\s*([\d.]+),\s*xP\s*=\s*([\d.]+)\)")
+PART_PREFIX_PATTERN = re.compile(r"^Parte\s\d\s")
+VOID_ELEMENTS = {
+    "area",
+    "base",
+    "col",
+    "embed",
+    "hr",
+    "img",
+    "input",
+    "link",
+    "meta",
+    "param",
+    "source",
+    "track",
+    "wbr",
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session(pool_size: int = 10) -> requests.Session:
+    """
+    Shared keep-alive session, safe to use from the fetching threads.
+    Connection errors and 429/5xx responses are retried with exponential backoff (0.5s, 1s, 2s...).
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(
+                total=4, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504], allowed_methods=["GET"]
+            )
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+            _session = requests.Session()
+            _session.headers["User-Agent"] = "Mozilla/5.0"
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+
+def fetch_page(url, session: requests.Session | None = None):
     """Fetches the HTML content of the given URL."""
-    response = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
+    response = (session or get_session()).get(url, timeout=FETCH_TIMEOUT)
     response.raise_for_status()  # Raise an error for bad status codes
     response.encoding = "utf-8"
     return response.text
@@ -18,8 +72,8 @@ class HtmlException(requests.exceptions.RequestException):
 
 
 def parse_html(html):
-    """Parses the HTML content using BeautifulSoup."""
-    return BeautifulSoup(html, "html.parser", from_encoding="latin-1")
+    """Parses the HTML content using BeautifulSoup, with the much faster lxml parser when it is installed."""
+    return BeautifulSoup(html, HTML_PARSER, from_encoding="latin-1")
 
 
 def extract_page_title(soup: BeautifulSoup):
@@ -58,6 +112,87 @@ def find_jf_game(soup: BeautifulSoup):
     return whole_json
 
 
+class RowParser(HTMLParser):
+    """
+    Single pass over the HTML of an answer row.
+    Collects everything the quiz extraction needs: the row as BeautifulSoup would serialize it, split on <br/>,
+    the text of the first <b> of each segment, the text of every <i> and which <i> follows <b>Resposta</b>.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.segments = [[]]
+        self.segment_b_texts = [None]
+        self.i_texts = []
+        self.answer_index = None
+        self._b = None  # [text pieces, child count, nesting depth] of the outermost open <b>
+        self._open_i = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "br":
+            # <br/> separates the segments and reads as a space inside the question and answer
+            for pieces in self._open_i:
+                pieces.append(" ")
+            self.segments.append([])
+            self.segment_b_texts.append(None)
+            return
+        attributes = "".join(f' {key}="{escape(value or "", quote=True)}"' for key, value in attrs)
+        self.segments[-1].append(f"<{tag}{attributes}{'/' if tag in VOID_ELEMENTS else ''}>")
+        if self._b is not None:
+            self._b[1] += 1
+            if tag == "b":
+                self._b[2] += 1
+        elif tag == "b":
+            self._b = [[], 0, 1]
+            if self.segment_b_texts[-1] is None:
+                self.segment_b_texts[-1] = self._b[0]
+        if tag == "i":
+            self._open_i.append([])
+            self.i_texts.append(self._open_i[-1])
+
+    def handle_endtag(self, tag):
+        if tag == "br" or tag in VOID_ELEMENTS:
+            return
+        self.segments[-1].append(f"</{tag}>")
+        if tag == "i" and self._open_i:
+            self._open_i.pop()
+        elif tag == "b" and self._b is not None:
+            self._b[2] -= 1
+            if self._b[2] == 0:
+                pieces, children, _ = self._b
+                if self.answer_index is None and children == 1 and pieces == ["Resposta"]:
+                    self.answer_index = len(self.i_texts)
+                self._b = None
+
+    def handle_data(self, data):
+        self.segments[-1].append(data.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;"))
+        if self._b is not None:
+            self._b[0].append(data)
+            self._b[1] += 1
+        for pieces in self._open_i:
+            pieces.append(data)
+
+    def parts(self) -> list[str]:
+        return ["".join(segment) for segment in self.segments]
+
+    def b_text(self, segment: int) -> str | None:
+        # Same as BeautifulSoup's get_text(strip=True)
+        pieces = self.segment_b_texts[segment]
+        return None if pieces is None else "".join(piece.strip() for piece in pieces)
+
+    def i_text(self, index: int | None) -> str:
+        if index is None or index >= len(self.i_texts):
+            return ""
+        return "".join(self.i_texts[index])
+
+
+def parse_row(row: str) -> RowParser:
+    parser = RowParser()
+    parser.feed(row)
+    parser.close()
+    return parser
+
+
 def extract_quiz_data(soup: BeautifulSoup) -> list[list[dict]]:
     whole_json = find_jf_game(soup)
     if not whole_json:
@@ -75,49 +210,33 @@ def extract_quiz_data(soup: BeautifulSoup) -> list[list[dict]]:
         if "text" not in part:
             continue
         for row in part["text"]:
-            soup_text = BeautifulSoup(row, "html.parser")
-            parts = re.split(r"<br\s*/>", str(soup_text))
+            row_parser = parse_row(row)
+            parts = row_parser.parts()
             if len(parts) < 2:
                 continue
-            player_tag = parts[0].strip()
-            player_soup = BeautifulSoup(player_tag, "html.parser")
-            b_tag = player_soup.find("b")
-            if b_tag:
-                full_name_and_team = b_tag.get_text(strip=True)
+            full_name_and_team = row_parser.b_text(0)
+            if full_name_and_team is not None:
                 player_name = full_name_and_team.split(" - ")[0]
                 team_name = full_name_and_team.split(" - ")[1]
-            final_part = parts[-1].strip()
-            final_soup = BeautifulSoup(final_part, "html.parser")
-            points_tag = final_soup.find("b")
-
-            if points_tag:
-                points = points_tag.get_text(strip=True)
-            theme_xt_xp = parts[1].strip()
-            pattern = re.compile(r"^(.*?)\s*\(xT\s*=\s*([\d.]+),\s*xP\s*=\s*([\d.]+)\)")
-            match = pattern.search(theme_xt_xp)
+            last_b_text = row_parser.b_text(len(parts) - 1)
+            if last_b_text is not None:
+                points = last_b_text
+            match = THEME_PATTERN.search(parts[1].strip())
             if match:
                 theme = match.group(1).strip()
                 # Remove "Parte X " from theme if present
-                theme = re.sub(r"^Parte\s\d\s", "", theme).strip()
+                theme = PART_PREFIX_PATTERN.sub("", theme).strip()
                 xt = float(match.group(2))
                 xp = float(match.group(3))
             else:
                 continue
-            for br in soup_text.find_all("br"):
-                br.replace_with(" ")
-            # Extract question
-            question_tag = soup_text.find("i")
-            question = question_tag.get_text() if question_tag else ""
-            # Extract answer
-            answer_tag = soup_text.find("b", string="Resposta")
-            answer = answer_tag.find_next("i").get_text() if answer_tag else ""
             part_data.append(
                 {
                     "theme": theme,
                     "xT": xt,
                     "xP": xp,
-                    "question": question,
-                    "answer": answer,
+                    "question": row_parser.i_text(0),
+                    "answer": row_parser.i_text(row_parser.answer_index),
                     "player": player_name,
                     "team": team_name,
                     "guessed": points == "2",
@@ -1,5 +1,8 @@
 import re
+import time
+from concurrent.futures import Executor
 
+from quizzes.management.commands.utils.archive import read_page, write_page
 from quizzes.management.commands.utils.html import (
     extract_page_title,
     extract_quiz_data,
@@ -8,7 +11,7 @@ from quizzes.management.commands.utils.html import (
     parse_html,
     sort_quiz_data,
 )
-from quizzes.management.commands.utils.ppt import create_ppt
+from quizzes.management.commands.utils.timing import StageTimings
 
 
 def extract_season_week(url):
@@ -25,19 +28,59 @@ def extract_season_week(url):
     return season, week
 
 
-def get_quiz_data(url: str):
+def load_page(url: str, offline: bool = False) -> str:
+    """
+    Fetch and archive a quiz page, or with `offline` read its archived copy without any request.
+    """
+    if offline:
+        return read_page(url)
     html_content = fetch_page(url)
-    soup = parse_html(html_content)
-    page_title = extract_page_title(soup)
-    quiz_data = extract_quiz_data(soup)
-    sorted_data = sort_quiz_data(quiz_data)
-    season, week = extract_season_week(url)
-    quiz = {"season": season, "week": week}
+    write_page(url, html_content)
+    return html_content
+
+
+def get_quiz_data(
+    url: str, timings: StageTimings | None = None, offline: bool = False, parse_executor: Executor | None = None
+):
+    """
+    Load and parse a quiz page. With a `parse_executor`, e.g. a process pool, the CPU-bound parsing runs in it
+    and only the resulting quiz dict comes back.
+    """
+    timings = timings or StageTimings()
+    with timings.stage("fetch"):
+        html_content = load_page(url, offline)
+    if parse_executor is None:
+        return build_quiz_data(url, html_content, timings)
+    quiz_data, elapsed = parse_executor.submit(parse_quiz_page, url, html_content).result()
+    timings.add("parse", elapsed)
+    return quiz_data
+
+
+def parse_quiz_page(url: str, html_content: str) -> tuple[dict, float]:
+    """
+    build_quiz_data for a worker process. Timings do not cross processes, so the parse time is returned with the quiz.
+    """
+    started = time.perf_counter()
+    quiz_data = build_quiz_data(url, html_content)
+    return quiz_data, time.perf_counter() - started
+
+
+def build_quiz_data(url: str, html_content: str, timings: StageTimings | None = None):
+    """
+    Turn the HTML of a quiz page into the data `create_quiz` persists. `url` is only used for the season and week.
+    The decks are not rendered here: they are rendered on their first download, see quizzes.presentations.
+    """
+    timings = timings or StageTimings()
+    with timings.stage("parse"):
+        soup = parse_html(html_content)
+        page_title = extract_page_title(soup)
+        quiz_data = extract_quiz_data(soup)
+        sorted_data = sort_quiz_data(quiz_data)
+        season, week = extract_season_week(url)
+    quiz = {"season": season, "week": week, "title": page_title}
     parts = []
     for i, part_data in enumerate(sorted_data, 1):
-        ppt_filename = f"{page_title} - Parte {i}"
         themes = [theme for theme in get_sorted_themes(part_data) if not theme.startswith("Mystery Box")]
-        ppt = create_ppt(part_data, ppt_filename)
-        parts.append({"sequence": i, "themes": themes, "questions": part_data, "ppt": ppt})
+        parts.append({"sequence": i, "themes": themes, "questions": part_data})
     quiz["parts"] = parts
     return quiz
@@ -48,11 +48,12 @@ def create_ppt(data, output_file):
         body_shape: Shape = slide.shapes.placeholders[1]
         tf = body_shape.text_frame
         tf.text = row["answer"]
-        # footer with xP
-        footer = slide.shapes.add_textbox(left * 2, prs.slide_height - top, prs.slide_width - 4 * width, height)
-        footer.text_frame.text = f"xP: {row['xP']}"
-        footer.text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
-        footer.text_frame.paragraphs[0].font.color.rgb = RGBColor.from_string("c0c0c0")
+        # footer with xP, unknown for questions imported before it was stored
+        if row["xP"] is not None:
+            footer = slide.shapes.add_textbox(left * 2, prs.slide_height - top, prs.slide_width - 4 * width, height)
+            footer.text_frame.text = f"xP: {row['xP']}"
+            footer.text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
+            footer.text_frame.paragraphs[0].font.color.rgb = RGBColor.from_string("c0c0c0")
 
     # Add hyperlinks from the index slide to the first question slide of each theme
     for i, theme in enumerate(themes, 1):
@@ -0,0 +1,48 @@
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+
+class StageTimings:
+    """
+    Thread-safe accumulator of the time spent in each stage of an import.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.totals = defaultdict(float)
+        self.counts = defaultdict(int)
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, elapsed: float):
+        with self._lock:
+            self.totals[name] += elapsed
+            self.counts[name] += 1
+
+    def report(self) -> list[str]:
+        return [
+            f"{name:>6}: {total:8.2f} s total, {total / self.counts[name] * 1000:8.1f} ms avg over {self.counts[name]}"
+            for name, total in self.totals.items()
+        ]
+
+
+class QueryCounter:
+    """
+    Counts the executed statements, without the cap of the debug query log.
+    Use as `with connection.execute_wrapper(counter):`.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
@@ -0,0 +1,45 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.management.base import BaseCommand
+
+from quizstats.cache import LEADERBOARD_VERSION, cached_response, stats_version
+from quizzes.models import CategoryGroup
+from quizzes.serializers import QuizProgressSerializer
+from quizzes.stats import get_category_leaderboard, get_quiz_progress_queryset
+from teams.views import TeamCategoryGroupStatsView, TeamCategoryStatsView
+from users.views import UserCategoryGroupStatsView, UserCategoryStatsView
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Prefill the stats response cache for every user and team, e.g. right after a deploy or a stats rebuild"
+
+    def handle(self, *args, **options):
+        users = list(User.objects.exclude(is_staff=True))
+        for user in users:
+            UserCategoryStatsView().get_cached_stats_data(user)
+            UserCategoryGroupStatsView().get_cached_stats_data(user)
+            # Same key as an unfiltered, unpaginated request to the quiz progress list
+            cached_response(
+                "quiz-progress",
+                f"user:{user.pk}:",
+                lambda: QuizProgressSerializer(get_quiz_progress_queryset(user), many=True).data,
+                versions=(stats_version(f"user:{user.pk}"),),
+            )
+        self.stdout.write(f"Warmed the stats of {len(users)} users.")
+
+        teams = list(Group.objects.all())
+        for team in teams:
+            TeamCategoryStatsView().get_cached_stats_data(team)
+            TeamCategoryGroupStatsView().get_cached_stats_data(team)
+        self.stdout.write(f"Warmed the stats of {len(teams)} teams.")
+
+        for category_group_id in [None, *CategoryGroup.objects.values_list("id", flat=True)]:
+            cached_response(
+                "category-leaderboard",
+                f"group:{category_group_id}:min:1",
+                lambda: get_category_leaderboard(category_group_id=category_group_id),
+                versions=(LEADERBOARD_VERSION,),
+            )
+        self.stdout.write(self.style.SUCCESS("Stats cache warm-up complete!"))
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.4 on 2026-10-18 11:51
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_quiz_questions(apps, schema_editor):
+    Quiz = apps.get_model("quizzes", "Quiz")
+    for quiz in Quiz.objects.annotate(question_count=Count("parts__topics__questions")):
+        quiz.total_questions = quiz.question_count
+        quiz.save(update_fields=["total_questions"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("quizzes", "0006_alter_category_description"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="quiz",
+            name="total_questions",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_quiz_questions, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("quizzes", "0007_quiz_total_questions"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="QuizSnapshot",
+            fields=[
+                (
+                    "quiz",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="snapshot",
+                        serialize=False,
+                        to="quizzes.quiz",
+                    ),
+                ),
+                ("version", models.CharField(max_length=32)),
+                ("document", models.TextField()),
+                ("rendered_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
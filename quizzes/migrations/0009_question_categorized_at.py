@@ -0,0 +1,25 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:04
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def mark_categorized_questions(apps, schema_editor):
+    # Questions without categories are left pending, so categorize_pending gives them another try
+    Question = apps.get_model("quizzes", "Question")
+    Question.objects.filter(categories__isnull=False).update(categorized_at=timezone.now())
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("quizzes", "0008_quiz_snapshot"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="question",
+            name="categorized_at",
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.RunPython(mark_categorized_questions, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("quizzes", "0009_question_categorized_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="question",
+            name="xp",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="quiz",
+            name="title",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="quizpart",
+            name="ppt_source_hash",
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:24
+
+from django.db import migrations, models
+
+from answers.backfill import backfill_stats
+from quizzes.duplicates import merge_duplicate_questions
+
+
+def hash_and_merge_questions(apps, schema_editor):
+    _, user_ids = merge_duplicate_questions(
+        apps.get_model("quizzes", "Question"),
+        apps.get_model("quizzes", "Topic"),
+        apps.get_model("answers", "UserAnswer"),
+    )
+    # Merging drops the answers given to the copies, so the rollups of those users count them no more
+    if user_ids:
+        backfill_stats(apps, user_ids)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("answers", "0004_user_quiz_progress"),
+        ("quizzes", "0010_lazy_presentations"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="question",
+            name="content_hash",
+            field=models.CharField(default="", editable=False, max_length=64),
+            preserve_default=False,
+        ),
+        migrations.RunPython(hash_and_merge_questions, reverse_code=migrations.RunPython.noop),
+    ]
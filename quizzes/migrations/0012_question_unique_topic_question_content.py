@@ -0,0 +1,16 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("quizzes", "0011_question_content_hash"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="question",
+            constraint=models.UniqueConstraint(fields=("topic", "content_hash"), name="unique_topic_question_content"),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("quizzes", "0012_question_unique_topic_question_content"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="quizsnapshot",
+            name="version",
+            field=models.CharField(max_length=65),
+        ),
+    ]
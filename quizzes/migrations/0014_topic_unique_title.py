@@ -0,0 +1,32 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:55
+
+from django.db import migrations, models
+
+from answers.backfill import backfill_stats
+from quizzes.duplicates import merge_duplicate_questions
+
+
+def merge_duplicate_topics(apps, schema_editor):
+    # Also refreshes the content hashes left stale by topics renamed before their questions were rehashed on save
+    _, user_ids = merge_duplicate_questions(
+        apps.get_model("quizzes", "Question"),
+        apps.get_model("quizzes", "Topic"),
+        apps.get_model("answers", "UserAnswer"),
+    )
+    if user_ids:
+        backfill_stats(apps, user_ids)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("answers", "0005_backfill_stats"),
+        ("quizzes", "0013_quiz_snapshot_version_length"),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_topics, reverse_code=migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="topic",
+            constraint=models.UniqueConstraint(fields=("quiz_part", "title"), name="unique_quiz_part_topic_title"),
+        ),
+    ]
@@ -1,35 +1,96 @@
-from django.db.models import QuerySet
+from django.db.models import FilteredRelation, Q, Sum
+from django.db.models.functions import Coalesce
+from django.utils.cache import get_conditional_response, patch_cache_control
 from rest_framework.response import Response
 
-from answers.models import UserAnswer
+from quizstats.cache import cached_response, get_version, stats_version
 from quizstats.constants import MIN_ANSWERS
 from quizzes.models import Category, CategoryGroup
 from quizzes.serializers import CategoryGroupStatsSerializer, CategoryStatsSerializer
 
 
-class CategoryGroupStatsMixin:
-    serializer_class = CategoryGroupStatsSerializer
+class ConditionalGetMixin:
+    """
+    Strong ETags for read-only endpoints, derived from a content version instead of the response body.
+    A matching If-None-Match is answered with a 304 before any query or serialization runs.
+    The ETag includes the URL arguments: ETags are only handed out with 200 responses, so an object that does not
+    exist never matches one, and the ETag of an object never matches another.
+    """
 
-    def get_user_answers(self):
-        raise NotImplementedError("Subclasses must implement get_user_answers()")
+    etag_versions = ()
+    cache_max_age = 24 * 60 * 60  # 1 day
 
-    def get_category_group_stats(self, user_answers: QuerySet[UserAnswer]):
-        all_category_groups = CategoryGroup.objects.all().order_by("id")
-        category_group_stats = {
-            group.pk: {"group_name": group.name, "correct": 0, "total": 0} for group in all_category_groups
-        }
-        for ua in user_answers:
-            groups_for_question = {c.group_id for c in ua.question.categories.all()}
-            for group_id in groups_for_question:
-                stats = category_group_stats[group_id]
-                stats["total"] += 1
-                if ua.is_correct:
-                    stats["correct"] += 1
-        return category_group_stats
+    def get_etag_versions(self):
+        return self.etag_versions
+
+    def get_etag(self):
+        parts = [get_version(name) for name in self.get_etag_versions()]
+        parts += [f"{name}={value}" for name, value in sorted(self.kwargs.items())]
+        return '"' + "-".join(parts) + '"'
+
+    def get(self, request, *args, **kwargs):
+        etag = self.get_etag()
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        response["ETag"] = etag
+        patch_cache_control(response, public=True, max_age=self.cache_max_age)
+        return response
+
+
+class CachedStatsMixin:
+    """
+    Serves the stats of a subject (a user or a team) from the versioned response cache.
+    """
+
+    stats_cache_name = None
+    stats_subject = None
+
+    def get_user_ids(self, subject):
+        raise NotImplementedError("Subclasses must implement get_user_ids()")
+
+    def get_stats_data(self, user_ids):
+        raise NotImplementedError("Subclasses must implement get_stats_data()")
+
+    def get_cached_stats_data(self, subject):
+        subject_key = f"{self.stats_subject}:{subject.pk}"
+        return cached_response(
+            self.stats_cache_name,
+            subject_key,
+            lambda: self.get_stats_data(self.get_user_ids(subject)),
+            versions=(stats_version(subject_key),),
+        )
 
     def get(self, *args, **kwargs):
-        user_answers = self.get_user_answers()
-        stats = self.get_category_group_stats(user_answers)
+        return Response(self.get_cached_stats_data(self.get_object()))
+
+
+class CategoryGroupStatsMixin(CachedStatsMixin):
+    serializer_class = CategoryGroupStatsSerializer
+    stats_cache_name = "category-group-stats"
+
+    def get_category_group_stats(self, user_ids):
+        # One grouped query: every group, left-joined to the rollups of the subject's users only
+        rows = (
+            CategoryGroup.objects.annotate(
+                subject_stats=FilteredRelation("user_stats", condition=Q(user_stats__user_id__in=user_ids))
+            )
+            .order_by("id")
+            .values_list("id", "name")
+            .annotate(
+                correct=Coalesce(Sum("subject_stats__correct"), 0),
+                total=Coalesce(Sum("subject_stats__total"), 0),
+            )
+        )
+        return {
+            group_id: {"group_name": name, "correct": correct, "total": total}
+            for group_id, name, correct, total in rows
+        }
+
+    def get_stats_data(self, user_ids):
+        stats = self.get_category_group_stats(user_ids)
         response_data = [
             {
                 "group_id": category_group_id,
@@ -40,38 +101,34 @@ class CategoryGroupStatsMixin:
             for category_group_id, stats in stats.items()
         ]
         response_data = sorted(response_data, key=lambda x: x["group_id"])
-        serializer = self.get_serializer(response_data, many=True)
-        return Response(serializer.data)
+        # Not get_serializer(): the cache warmer calls this without a request
+        return self.serializer_class(response_data, many=True).data
 
 
-class CategoryStatsMixin:
+class CategoryStatsMixin(CachedStatsMixin):
     serializer_class = CategoryStatsSerializer
+    stats_cache_name = "category-stats"
 
-    def get_user_answers(self):
-        raise NotImplementedError("Subclasses must implement get_user_answers()")
-
-    def get_category_stats(self, user_answers: QuerySet[UserAnswer]):
-        all_categories = Category.objects.select_related("group").all().order_by("group__id", "id")
-        category_stats = {
-            category.pk: {
-                "category_name": category.name,
-                "category_group_id": category.group.id if category.group else None,
-                "correct": 0,
-                "total": 0,
-            }
-            for category in all_categories
+    def get_category_stats(self, user_ids):
+        # One grouped query: every category, left-joined to the rollups of the subject's users only
+        rows = (
+            Category.objects.annotate(
+                subject_stats=FilteredRelation("user_stats", condition=Q(user_stats__user_id__in=user_ids))
+            )
+            .order_by("group__id", "id")
+            .values_list("id", "name", "group_id")
+            .annotate(
+                correct=Coalesce(Sum("subject_stats__correct"), 0),
+                total=Coalesce(Sum("subject_stats__total"), 0),
+            )
+        )
+        return {
+            category_id: {"category_name": name, "category_group_id": group_id, "correct": correct, "total": total}
+            for category_id, name, group_id, correct, total in rows
         }
-        for ua in user_answers:
-            for category in ua.question.categories.all():
-                stats = category_stats[category.pk]
-                stats["total"] += 1
-                if ua.is_correct:
-                    stats["correct"] += 1
-        return category_stats
 
-    def get(self, *args, **kwargs):
-        user_answers = self.get_user_answers()
-        stats = self.get_category_stats(user_answers)
+    def get_stats_data(self, user_ids):
+        stats = self.get_category_stats(user_ids)
         response_data = [
             {
                 "category_id": category_id,
@@ -83,5 +140,4 @@ class CategoryStatsMixin:
             for category_id, stats in stats.items()
         ]
         response_data = sorted(response_data, key=lambda x: (x["category_group_id"], x["category_id"]))
-        serializer = self.get_serializer(response_data, many=True)
-        return Response(serializer.data)
+        return self.serializer_class(response_data, many=True).data
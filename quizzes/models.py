@@ -1,9 +1,13 @@
 from django.db import models
 
+from quizzes.duplicates import get_content_hash
+
 
 class Quiz(models.Model):
     season = models.PositiveSmallIntegerField()
     week = models.CharField(max_length=10)
+    title = models.CharField(max_length=255, blank=True)
+    total_questions = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         constraints = [models.UniqueConstraint(fields=["season", "week"], name="unique_quiz_season_week")]
@@ -18,7 +22,9 @@ def ppt_upload_path(instance, filename):  # TODO: move
     week = instance.quiz.week
     part_num = instance.sequence
     ext = filename.split(".")[-1]
-    return f"quiz_ppts/S{season}/w{week}_part_{part_num}.{ext}"
+    # Rendered decks are named after their content, so a new render never takes the name of the deck it replaces
+    suffix = f"_{instance.ppt_source_hash[:12]}" if instance.ppt_source_hash else ""
+    return f"quiz_ppts/S{season}/w{week}_part_{part_num}{suffix}.{ext}"
 
 
 class QuizPart(models.Model):
@@ -27,6 +33,8 @@ class QuizPart(models.Model):
     ppt_file = models.FileField(
         upload_to=ppt_upload_path, blank=True, null=True, help_text="Optional PowerPoint file for this quiz part"
     )
+    # Hash of the content ppt_file was rendered from, to re-render it only when the questions change
+    ppt_source_hash = models.CharField(max_length=64, blank=True, editable=False)
 
     class Meta:
         constraints = [models.UniqueConstraint(fields=["quiz", "sequence"], name="unique_part_per_quiz_sequence")]
@@ -39,9 +47,23 @@ class Topic(models.Model):
     title = models.CharField(max_length=100)
     quiz_part = models.ForeignKey(to=QuizPart, on_delete=models.CASCADE, related_name="topics")
 
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["quiz_part", "title"], name="unique_quiz_part_topic_title")]
+
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        retitled = not self._state.adding and (update_fields is None or "title" in update_fields)
+        super().save(*args, **kwargs)
+        if retitled:
+            # The content hash of a question covers the title of its topic
+            questions = list(self.questions.only("id", "statement", "answer", "content_hash"))
+            for question in questions:
+                question.content_hash = get_content_hash(self.title, question.statement, question.answer)
+            Question.objects.bulk_update(questions, ["content_hash"])
+
 
 class CategoryGroup(models.Model):
     name = models.CharField(max_length=100, unique=True)
@@ -69,6 +91,34 @@ class Question(models.Model):
     statement = models.TextField(max_length=1000)
     answer = models.TextField(max_length=255)
     is_box = models.BooleanField(default=False)
+    xp = models.FloatField(null=True, blank=True)
+    # Unset until the LLM categorization has run, so skipped or failed questions can be picked up later
+    categorized_at = models.DateTimeField(null=True, blank=True, editable=False, db_index=True)
+    # Identifies the question within its topic, so re-imports update it instead of adding a copy
+    content_hash = models.CharField(max_length=64, editable=False)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["topic", "content_hash"], name="unique_topic_question_content")]
 
     def __str__(self):
         return self.statement
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or {"topic", "statement", "answer"} & set(update_fields):
+            self.content_hash = get_content_hash(self.topic.title, self.statement, self.answer)
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "content_hash"}
+        super().save(*args, **kwargs)
+
+
+class QuizSnapshot(models.Model):
+    """
+    Pre-rendered JSON document of a quiz, as served by the quiz endpoint.
+    A snapshot is only valid for the catalog and quiz content versions it was rendered under.
+    """
+
+    quiz = models.OneToOneField(to=Quiz, on_delete=models.CASCADE, primary_key=True, related_name="snapshot")
+    version = models.CharField(max_length=65)
+    document = models.TextField()
+    rendered_at = models.DateTimeField(auto_now=True)
@@ -0,0 +1,24 @@
+from rest_framework.pagination import CursorPagination
+
+
+class OptionalCursorPagination(CursorPagination):
+    """
+    Cursor pagination that only applies when the client asks for it with `?cursor=` or `?page_size=`.
+    Without either parameter the full list is returned, as before pagination existed.
+    """
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if (
+            self.cursor_query_param not in request.query_params
+            and self.page_size_query_param not in request.query_params
+        ):
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+
+class QuizCursorPagination(OptionalCursorPagination):
+    ordering = ("season", "week")
@@ -0,0 +1,52 @@
+import random
+
+import numpy as np
+from django.core.cache import cache
+
+from answers.bitsets import get_answered_bitset
+from quizstats.cache import bump_version, get_version
+from quizzes.models import Question
+
+POOL_TIMEOUT = 24 * 60 * 60  # 1 day
+POOL_VERSION = "unanswered_topics"
+
+
+def _pool_key(user_id: int) -> str:
+    # the version changes whenever questions are added or removed, which invalidates every pool at once
+    return f"unanswered_topics:{get_version(POOL_VERSION)}:{user_id}"
+
+
+def unanswered_topic_ids(user_id: int, topic_ids=None) -> set[int]:
+    """
+    Ids of the topics (optionally among `topic_ids`) with at least one question the user has not answered yet.
+    """
+    questions = Question.objects.all() if topic_ids is None else Question.objects.filter(topic_id__in=topic_ids)
+    pairs = np.array(list(questions.values_list("id", "topic_id")), dtype=np.int64).reshape(-1, 2)
+    answered = get_answered_bitset(user_id).answered_mask(pairs[:, 0])
+    return set(np.unique(pairs[~answered, 1]).tolist())
+
+
+def get_unanswered_topic_pool(user_id: int) -> list[int]:
+    key = _pool_key(user_id)
+    pool = cache.get(key)
+    if pool is None:
+        pool = sorted(unanswered_topic_ids(user_id))
+        cache.set(key, pool, POOL_TIMEOUT)
+    return pool
+
+
+def pick_unanswered_topic_id(user_id: int) -> int | None:
+    pool = get_unanswered_topic_pool(user_id)
+    return random.choice(pool) if pool else None
+
+
+def invalidate_unanswered_topic_pools():
+    bump_version(POOL_VERSION)
+
+
+def drop_unanswered_topic_pools(user_ids):
+    """
+    Drop the cached pools of these users once their answers change; like the answered bitsets they are built from,
+    they are rebuilt on their next use rather than patched.
+    """
+    cache.delete_many([_pool_key(user_id) for user_id in user_ids])
@@ -0,0 +1,82 @@
+import hashlib
+import json
+import tempfile
+
+from django.core.files import File
+from django.db import transaction
+from django.db.models.fields.files import FieldFile
+
+from quizzes.management.commands.utils.ppt import create_ppt
+from quizzes.models import Question, QuizPart
+
+PPTX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+
+
+def get_presentation_title(part: QuizPart) -> str:
+    return f"{part.quiz.title or part.quiz} - Parte {part.sequence}"
+
+
+def get_presentation_rows(part: QuizPart) -> list[dict]:
+    """
+    The rows create_ppt renders, in the order of the import: themes alphabetically, Mystery Box last.
+    """
+    questions = (
+        Question.objects.filter(topic__quiz_part=part)
+        .order_by("id")
+        .values_list("topic__title", "statement", "answer", "xp")
+    )
+    rows = [
+        {"theme": theme, "question": statement, "answer": answer, "xP": xp}
+        for theme, statement, answer, xp in questions
+    ]
+    rows.sort(key=lambda row: (row["theme"].startswith("Mystery Box"), row["theme"]))
+    return rows
+
+
+def get_source_hash(title: str, rows: list[dict]) -> str:
+    return hashlib.sha256(json.dumps([title, rows], sort_keys=True).encode()).hexdigest()
+
+
+def render_presentation(part: QuizPart, title: str, rows: list[dict], source_hash: str):
+    """
+    Render the deck into a temporary file, which the storage then reads in chunks, and replace the stored one.
+    The new deck is stored under a new name and the old one is only deleted once the row points to the new one
+    and the transaction commits: storage is not transactional, and clients may be downloading the old deck.
+    """
+    old_name = part.ppt_file.name if part.ppt_file else None
+    part.ppt_source_hash = source_hash
+    with tempfile.TemporaryFile() as temporary_file:
+        create_ppt(rows, title).save(temporary_file)
+        temporary_file.seek(0)
+        part.ppt_file.save(f"{title}.pptx", File(temporary_file), save=False)
+    storage, new_name = part.ppt_file.storage, part.ppt_file.name
+    try:
+        part.save(update_fields=["ppt_file", "ppt_source_hash"])
+    except Exception:
+        storage.delete(new_name)
+        raise
+    if old_name and old_name != new_name:
+        transaction.on_commit(lambda: storage.delete(old_name))
+
+
+def get_part_presentation(part: QuizPart) -> FieldFile:
+    """
+    Return the deck of a quiz part, rendering it only when it is missing or its questions changed since it was
+    rendered. A deck attached before source hashes existed is adopted as the render of the current content.
+    """
+    title = get_presentation_title(part)
+    rows = get_presentation_rows(part)
+    source_hash = get_source_hash(title, rows)
+    if part.ppt_file and part.ppt_file.storage.exists(part.ppt_file.name):
+        if part.ppt_source_hash == source_hash:
+            return part.ppt_file
+        if not part.ppt_source_hash:
+            part.ppt_source_hash = source_hash
+            part.save(update_fields=["ppt_source_hash"])
+            return part.ppt_file
+    with transaction.atomic():
+        # Concurrent downloads of an outdated deck wait for the first render instead of rendering it again
+        part = QuizPart.objects.select_for_update(of=("self",)).select_related("quiz").get(pk=part.pk)
+        if part.ppt_source_hash != source_hash or not part.ppt_file:
+            render_presentation(part, title, rows, source_hash)
+    return part.ppt_file
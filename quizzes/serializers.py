@@ -73,6 +73,15 @@ class QuizProgressSerializer(serializers.ModelSerializer):
         fields = ["id", "season", "week", "progress", "correct"]
 
 
+class QuizProgressFilterSerializer(serializers.Serializer):
+    season = serializers.IntegerField(required=False, min_value=1)
+
+
+class RandomTopicFilterSerializer(serializers.Serializer):
+    season = serializers.IntegerField(required=False, min_value=1)
+    category_group = serializers.IntegerField(required=False, min_value=1)
+
+
 class QuestionCategoryUpdateSerializer(serializers.Serializer):
     category_ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False)
 
@@ -97,13 +106,22 @@ class CategoryStatsSerializer(serializers.Serializer):
     answered = serializers.IntegerField()
 
 
+class CategoryLeaderboardFilterSerializer(serializers.Serializer):
+    category_group = serializers.IntegerField(required=False, min_value=1)
+    min_answers = serializers.IntegerField(required=False, min_value=1, default=1)
+
+
 class AptitudeSerializer(serializers.Serializer):
     # request
     user_ids = serializers.ListField(child=serializers.IntegerField(), write_only=True, allow_empty=False)
     category_ids = serializers.ListField(child=serializers.IntegerField(), write_only=True, allow_empty=False)
+    quantiles = serializers.ListField(
+        child=serializers.FloatField(min_value=0, max_value=1), write_only=True, required=False
+    )
     # response
     user_id = serializers.IntegerField(read_only=True)
     aptitude = serializers.FloatField(read_only=True)
+    aptitude_quantiles = serializers.DictField(child=serializers.FloatField(), source="quantiles", read_only=True)
 
 
 class TopicInputSerializer(serializers.Serializer):
@@ -133,3 +151,7 @@ class XTSerializer(serializers.Serializer):
     # response
     team = TeamOutputSerializer(read_only=True)
     users = serializers.ListField(child=UserOutputSerializer(), read_only=True)
+
+
+class XTBatchSerializer(serializers.Serializer):
+    scenarios = XTSerializer(many=True, allow_empty=False, max_length=200)
@@ -1,11 +1,78 @@
-from django.db.models.signals import post_save
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
-from quizzes.models import Question
-from quizzes.utils import categorize_question
+from quizstats.cache import CATALOG_VERSION, bump_quiz_content_versions, bump_stats_version, bump_version_on_commit
+from quizzes.models import Category, CategoryGroup, Question, Quiz, QuizPart, Topic
+from quizzes.pools import invalidate_unanswered_topic_pools
+from quizzes.utils import schedule_categorization
 
 
 @receiver(post_save, sender=Question)
 def categorize_question_signal(sender, instance: Question, created, **kwargs):
     if created:
-        categorize_question(instance)
+        schedule_categorization([instance.pk])
+
+
+@receiver(post_save, sender=Question)
+def increment_quiz_total_questions(sender, instance: Question, created, **kwargs):
+    if created:
+        Quiz.objects.filter(parts__topics=instance.topic_id).update(total_questions=F("total_questions") + 1)
+        invalidate_unanswered_topic_pools()
+        bump_stats_version()
+
+
+@receiver(pre_delete, sender=Question)
+def decrement_quiz_total_questions(sender, instance: Question, **kwargs):
+    # pre_delete: when a whole quiz part or topic is deleted, the path up to the quiz is gone by post_delete
+    Quiz.objects.filter(parts__topics=instance.topic_id).update(total_questions=F("total_questions") - 1)
+    invalidate_unanswered_topic_pools()
+    bump_stats_version()
+
+
+def get_content_quiz_ids(sender, instance) -> set[int]:
+    """
+    The quiz whose content a saved or deleted row is part of.
+    """
+    if sender is Quiz:
+        return {instance.pk}
+    if sender is QuizPart:
+        return {instance.quiz_id}
+    if sender is Topic:
+        return set(QuizPart.objects.filter(pk=instance.quiz_part_id).values_list("quiz_id", flat=True))
+    return set(Topic.objects.filter(pk=instance.topic_id).values_list("quiz_part__quiz_id", flat=True))
+
+
+@receiver(post_save, sender=Quiz)
+@receiver(post_delete, sender=Quiz)
+@receiver(post_save, sender=QuizPart)
+@receiver(pre_delete, sender=QuizPart)
+@receiver(post_save, sender=Topic)
+@receiver(pre_delete, sender=Topic)
+@receiver(post_save, sender=Question)
+@receiver(pre_delete, sender=Question)
+def invalidate_quiz_content(sender, instance, **kwargs):
+    # pre_delete: the path up to the quiz may be gone by post_delete when a whole part or topic is deleted
+    bump_quiz_content_versions(get_content_quiz_ids(sender, instance))
+
+
+@receiver(m2m_changed, sender=Question.categories.through)
+def invalidate_quiz_content_categories(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        bump_quiz_content_versions(get_content_quiz_ids(Question, instance))
+    else:
+        # The category side: pre_clear still has the questions losing it
+        questions = instance.questions.all() if action == "pre_clear" else Question.objects.filter(pk__in=pk_set)
+        bump_quiz_content_versions(questions.values_list("topic__quiz_part__quiz_id", flat=True))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=CategoryGroup)
+@receiver(post_delete, sender=CategoryGroup)
+def invalidate_category_responses(sender, **kwargs):
+    # Category names show up in the catalog, in the quiz content and in the cached stats responses
+    bump_version_on_commit(CATALOG_VERSION)
+    bump_stats_version()
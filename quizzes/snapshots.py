@@ -0,0 +1,33 @@
+from rest_framework.renderers import JSONRenderer
+
+from quizstats.cache import CATALOG_VERSION, get_version, quiz_content_version
+from quizzes.models import Quiz, QuizSnapshot
+from quizzes.serializers import QuizSerializer
+
+
+def render_quiz_document(quiz_id: int) -> str:
+    """
+    Serialize a quiz with its whole tree prefetched, in a fixed number of queries.
+    """
+    quiz = Quiz.objects.prefetch_related("parts__topics__questions__categories").get(pk=quiz_id)
+    return JSONRenderer().render(QuizSerializer(quiz).data).decode()
+
+
+def get_quiz_document_version(quiz_id: int) -> str:
+    return f"{get_version(CATALOG_VERSION)}-{get_version(quiz_content_version(quiz_id))}"
+
+
+def get_quiz_document(quiz_id: int) -> str:
+    """
+    Return the JSON document of a quiz, re-rendering and storing it if its snapshot is missing or outdated.
+    Snapshots are keyed on the content version of their own quiz and on the catalog version, so a change to one
+    quiz leaves the snapshots of the others valid. The versions are read before rendering, so a content change
+    that lands mid-render leaves the stored snapshot outdated instead of silently stale.
+    """
+    version = get_quiz_document_version(quiz_id)
+    document = QuizSnapshot.objects.filter(quiz_id=quiz_id, version=version).values_list("document", flat=True).first()
+    if document is not None:
+        return document
+    document = render_quiz_document(quiz_id)
+    QuizSnapshot.objects.update_or_create(quiz_id=quiz_id, defaults={"version": version, "document": document})
+    return document
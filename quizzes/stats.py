@@ -0,0 +1,304 @@
+import threading
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+import numpy as np
+from django.db.models import Case, F, FilteredRelation, FloatField, Q, Value, When
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
+
+from answers.models import UserCategoryStats
+from quizstats.cache import ANSWER_MATRIX_VERSION, get_version
+from quizstats.constants import MIN_ANSWERS
+from quizzes.models import Category, Quiz
+
+
+def get_category_leaderboard(category_group_id: int | None = None, min_answers: int = 1) -> list[dict]:
+    """
+    Build the category x user leaderboard from the stats rollups in two queries, regardless of catalog size.
+    Users with fewer than `min_answers` answers in a category are left out of that category.
+    """
+    categories = Category.objects.all()
+    rollups = UserCategoryStats.objects.filter(total__gte=max(min_answers, 1))
+    if category_group_id is not None:
+        categories = categories.filter(group_id=category_group_id)
+        rollups = rollups.filter(category__group_id=category_group_id)
+    rollups = rollups.values_list(
+        "category_id", "user__username", "user__first_name", "user__last_name", "correct", "total"
+    )
+
+    users_by_category = defaultdict(list)
+    for category_id, username, first_name, last_name, correct, total in rollups:
+        # Compose display name: prefer full name if exists, else username
+        full_name = (first_name + " " + last_name).strip()
+        display_name = full_name if full_name else username
+        users_by_category[category_id].append({"user": display_name, "xC": (correct / total) * 2, "answered": total})
+
+    result = []
+    for category in categories:
+        users_result = users_by_category[category.pk]
+        # Sort users by xC descending
+        users_result.sort(key=lambda u: u["xC"], reverse=True)
+        result.append({"category_name": category.name, "users": users_result})
+    return result
+
+
+def get_quiz_progress_queryset(user, season: int | None = None):
+    """
+    Quizzes annotated with the progress and correct percentages of `user`, read from the stored counters.
+    """
+    quizzes = (
+        Quiz.objects.annotate(
+            user_progress_row=FilteredRelation("user_progress", condition=Q(user_progress__user=user))
+        )
+        .annotate(
+            total_answered=Coalesce(F("user_progress_row__answered"), 0),
+            total_correct=Coalesce(F("user_progress_row__correct"), 0),
+        )
+        .annotate(
+            # Add computed fields
+            progress=Case(
+                When(total_questions=0, then=Value(0.0)),
+                default=Cast("total_answered", FloatField()) * 100 / F("total_questions"),
+                output_field=FloatField(),
+            ),
+            correct=Case(
+                When(total_answered=0, then=Value(0.0)),
+                default=Cast("total_correct", FloatField()) * 100 / F("total_answered"),
+                output_field=FloatField(),
+            ),
+        )
+    )
+    if season is not None:
+        quizzes = quizzes.filter(season=season)
+    return quizzes.order_by("season", "week")
+
+
+class AnswerMatrix:
+    """
+    Dense users x categories matrix of answer counts, mirrored from the `UserCategoryStats` rollups.
+    Answer writes bump the `updated_at` of the rollup rows they touch, so each refresh only pulls the rows
+    changed since the previous one. This keeps every worker process in step without reloading the whole table.
+
+    A refresh builds new indexes and arrays and swaps them in at once, so concurrent `counts()` calls always read
+    a consistent state without waiting for the database.
+
+    A row committed more than REFRESH_OVERLAP after the timestamp it was written with is missed by the delta
+    refresh. Answer writes are short transactions, far below that; the rebuilds, which can take longer, bump
+    ANSWER_MATRIX_VERSION on commit and every matrix reloads in full on its next refresh.
+
+    Rollups are zeroed rather than deleted, so deleted rows only come from deleting a user or a category, whose
+    stale counts stay in the matrix until the periodic full reload.
+    """
+
+    # Overlap between refreshes, covering rows committed slightly after the timestamp they were written with
+    REFRESH_OVERLAP = timedelta(seconds=5)
+    FULL_RELOAD_INTERVAL = timedelta(minutes=30)
+
+    def __init__(self):
+        # Serializes refreshes; `_state_lock` only guards the swap of the published state
+        self._lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self.user_index: dict[int, int] = {}
+        self.category_index: dict[int, int] = {}
+        self.correct = np.zeros((0, 0), dtype=np.int32)
+        self.total = np.zeros((0, 0), dtype=np.int32)
+        self.loaded_at = None
+        self.loaded_version = None
+        self.last_seen = None
+
+    def refresh(self):
+        with self._lock:
+            now = timezone.now()
+            # Read before the rows, so a bump committed while they load forces another full reload
+            version = get_version(ANSWER_MATRIX_VERSION)
+            rollups = UserCategoryStats.objects.all()
+            full_reload = (
+                self.loaded_at is None
+                or now - self.loaded_at >= self.FULL_RELOAD_INTERVAL
+                or version != self.loaded_version
+            )
+            if full_reload:
+                user_index, category_index = {}, {}
+                correct = np.zeros((0, 0), dtype=np.int32)
+                total = np.zeros((0, 0), dtype=np.int32)
+                last_seen = None
+            else:
+                user_index, category_index = dict(self.user_index), dict(self.category_index)
+                correct, total = self.correct, self.total
+                last_seen = self.last_seen
+                if last_seen is not None:
+                    rollups = rollups.filter(updated_at__gte=last_seen - self.REFRESH_OVERLAP)
+            rows = list(rollups.values_list("user_id", "category_id", "correct", "total", "updated_at"))
+            if rows:
+                for row in rows:
+                    user_index.setdefault(row[0], len(user_index))
+                    category_index.setdefault(row[1], len(category_index))
+                correct = self._resized(correct, (len(user_index), len(category_index)))
+                total = self._resized(total, (len(user_index), len(category_index)))
+                user_idx = np.fromiter((user_index[row[0]] for row in rows), dtype=np.intp, count=len(rows))
+                category_idx = np.fromiter((category_index[row[1]] for row in rows), dtype=np.intp, count=len(rows))
+                # Rows carry absolute counts, so applying the same row twice is harmless
+                correct[user_idx, category_idx] = np.fromiter((row[2] for row in rows), dtype=np.int32)
+                total[user_idx, category_idx] = np.fromiter((row[3] for row in rows), dtype=np.int32)
+                latest = max(row[4] for row in rows)
+                last_seen = latest if last_seen is None else max(last_seen, latest)
+            elif not full_reload:
+                return
+            with self._state_lock:
+                self.user_index, self.category_index = user_index, category_index
+                self.correct, self.total = correct, total
+                self.last_seen = last_seen
+                if full_reload:
+                    self.loaded_at, self.loaded_version = now, version
+
+    @staticmethod
+    def _resized(array: np.ndarray, shape: tuple[int, int]) -> np.ndarray:
+        """
+        A copy of `array` padded with zeros to `shape`. Published arrays are never written in place.
+        """
+        resized = np.zeros(shape, dtype=np.int32)
+        resized[: array.shape[0], : array.shape[1]] = array
+        return resized
+
+    def counts(self, user_ids: list[int], category_ids: list[int]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return the (correct, total) submatrices for the given users and categories, in the given order.
+        Users or categories without any answers come back as rows or columns of zeros.
+        """
+        with self._state_lock:
+            user_index, category_index = self.user_index, self.category_index
+            matrix_correct, matrix_total = self.correct, self.total
+        correct = np.zeros((len(user_ids), len(category_ids)), dtype=np.int32)
+        total = np.zeros((len(user_ids), len(category_ids)), dtype=np.int32)
+        rows = [(i, user_index[uid]) for i, uid in enumerate(user_ids) if uid in user_index]
+        cols = [(j, category_index[cid]) for j, cid in enumerate(category_ids) if cid in category_index]
+        if rows and cols:
+            out_rows, src_rows = map(list, zip(*rows))
+            out_cols, src_cols = map(list, zip(*cols))
+            correct[np.ix_(out_rows, out_cols)] = matrix_correct[np.ix_(src_rows, src_cols)]
+            total[np.ix_(out_rows, out_cols)] = matrix_total[np.ix_(src_rows, src_cols)]
+        return correct, total
+
+
+answer_matrix = AnswerMatrix()
+
+
+def get_answer_matrix() -> AnswerMatrix:
+    answer_matrix.refresh()
+    return answer_matrix
+
+
+def weighted_quantiles(values: np.ndarray, weights: np.ndarray, quantiles) -> np.ndarray:
+    """
+    Row-wise weighted quantiles of a 2D `values` array, without expanding the weights into repeated values.
+    `weights` holds non-negative frequency weights, either per value or one per column; a weight of 0 leaves a
+    value out. Results match `np.quantile` (linear method) on each row's expanded list of values.
+    Returns a (rows, len(quantiles)) array, with NaN for rows whose weights add up to 0.
+    """
+    values = np.asarray(values, dtype=float)
+    weights = np.broadcast_to(np.asarray(weights, dtype=np.int64), values.shape)
+    quantiles = np.asarray(quantiles, dtype=float)
+    if values.shape[1] == 0:
+        return np.full((values.shape[0], len(quantiles)), np.nan)
+
+    order = np.argsort(values, axis=1, kind="stable")
+    sorted_values = np.take_along_axis(values, order, axis=1)
+    cumulative_weights = np.cumsum(np.take_along_axis(weights, order, axis=1), axis=1)
+    total_weights = cumulative_weights[:, -1:]
+
+    # position of each quantile in the (virtual) expanded sorted list of every row
+    positions = quantiles[None, :] * np.maximum(total_weights - 1, 0)
+    lower = np.floor(positions)
+    fraction = positions - lower
+
+    def value_at(expanded_positions):
+        # the value at expanded position j is the first one whose cumulative weight exceeds j
+        indices = (cumulative_weights[:, None, :] <= expanded_positions[:, :, None]).sum(axis=2)
+        return np.take_along_axis(sorted_values, np.minimum(indices, values.shape[1] - 1), axis=1)
+
+    lower_values = value_at(lower)
+    upper_values = value_at(np.ceil(positions))
+    result = lower_values + fraction * (upper_values - lower_values)
+    result[total_weights[:, 0] == 0] = np.nan
+    return result
+
+
+def get_aptitudes(matrix: AnswerMatrix, user_ids: list[int], category_ids: list[int], quantiles=()) -> list[dict]:
+    """
+    Aptitude of each user: twice the median of their per-category accuracy, weighted by how often each category
+    appears in `category_ids`. Categories with fewer than MIN_ANSWERS answers are left out.
+    Extra `quantiles` (e.g. 0.25, 0.75) are returned on the same scale, keyed as "p25", "p75".
+    """
+    category_weights = Counter(category_ids)
+    unique_category_ids = list(category_weights.keys())
+    weights = np.fromiter(category_weights.values(), dtype=np.int64, count=len(category_weights))
+    correct, total = matrix.counts(user_ids, unique_category_ids)
+    valid = total >= MIN_ANSWERS
+    accuracy = np.divide(correct, total, out=np.zeros(total.shape), where=valid)
+
+    quantiles = list(quantiles)
+    scores = 2 * weighted_quantiles(accuracy, np.where(valid, weights, 0), [0.5, *quantiles])
+    scores = np.nan_to_num(scores, nan=0.0)
+
+    results = []
+    for user_id, user_scores in zip(user_ids, scores):
+        result = {"user_id": user_id, "aptitude": float(user_scores[0])}
+        if quantiles:
+            result["quantiles"] = {f"p{q * 100:g}": float(score) for q, score in zip(quantiles, user_scores[1:])}
+        results.append(result)
+    return results
+
+
+def get_topic_xts(matrix: AnswerMatrix, user_ids: list[int], topics: list[dict]) -> dict:
+    """
+    Expected score (xT) of each topic, per user and for the team as a whole.
+    A topic pools the answers of all its categories; fewer than MIN_ANSWERS pooled answers gives an xT of 0.
+    """
+    return get_scenario_xts(matrix, [{"user_ids": user_ids, "topics": topics}])[0]
+
+
+def get_scenario_xts(matrix: AnswerMatrix, scenarios: list[dict]) -> list[dict]:
+    """
+    `get_topic_xts` for many lineups at once: each scenario is a dict with "user_ids" and "topics".
+    The counts for every user and category involved are looked up once and shared by all scenarios.
+    """
+    user_ids = list(dict.fromkeys(uid for scenario in scenarios for uid in scenario["user_ids"]))
+    category_ids = list(
+        dict.fromkeys(cid for scenario in scenarios for topic in scenario["topics"] for cid in topic["category_ids"])
+    )
+    row = {uid: i for i, uid in enumerate(user_ids)}
+    column = {cid: j for j, cid in enumerate(category_ids)}
+    correct, total = matrix.counts(user_ids, category_ids)
+
+    results = []
+    for scenario in scenarios:
+        scenario_user_ids, topics = scenario["user_ids"], scenario["topics"]
+        # topics x categories, counting a category as many times as it is listed for the topic
+        topic_categories = np.zeros((len(topics), len(category_ids)), dtype=np.int32)
+        for i, topic in enumerate(topics):
+            for cid in topic["category_ids"]:
+                topic_categories[i, column[cid]] += 1
+
+        rows = [row[uid] for uid in scenario_user_ids]
+        user_correct = correct[rows] @ topic_categories.T
+        user_total = total[rows] @ topic_categories.T
+        team_correct = user_correct.sum(axis=0)
+        team_total = user_total.sum(axis=0)
+        user_xt = 2 * np.divide(
+            user_correct, user_total, out=np.zeros(user_total.shape), where=user_total >= MIN_ANSWERS
+        )
+        team_xt = 2 * np.divide(
+            team_correct, team_total, out=np.zeros(team_total.shape), where=team_total >= MIN_ANSWERS
+        )
+
+        result = {"team": {"topics": []}, "users": []}
+        for user_id, xts in zip(scenario_user_ids, user_xt):
+            topic_scores = [{"topic": topic["name"], "xT": float(xt)} for topic, xt in zip(topics, xts)]
+            topic_scores.sort(key=lambda x: x["xT"], reverse=True)
+            result["users"].append({"user_id": user_id, "topics": topic_scores})
+        team_topic_scores = [{"topic": topic["name"], "xT": float(xt)} for topic, xt in zip(topics, team_xt)]
+        team_topic_scores.sort(key=lambda x: x["xT"], reverse=True)
+        result["team"]["topics"] = team_topic_scores
+        results.append(result)
+    return results
@@ -0,0 +1,375 @@
+import io
+import json
+import tempfile
+from contextlib import redirect_stdout
+from datetime import timedelta
+from unittest import mock
+
+from bs4 import BeautifulSoup
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import IntegrityError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from answers.models import UserAnswer
+from answers.utils import rebuild_category_stats
+from quizstats.testing import create_answered_questions, create_quiz_part, get_test_categories, local_cache
+from quizzes.management.commands.benchmark_parser import DEFAULT_PAGES, legacy_extract_quiz_data
+from quizzes.management.commands.utils.data_creation import create_quiz
+from quizzes.management.commands.utils.html import extract_quiz_data, parse_html
+from quizzes.models import Category, Question, Quiz, QuizPart, QuizSnapshot, Topic
+from quizzes.snapshots import get_quiz_document
+from quizzes.stats import AnswerMatrix, get_category_leaderboard
+from quizzes.utils import categorization_disabled
+
+User = get_user_model()
+
+
+@local_cache
+class CategoryLeaderboardTests(TestCase):
+    """
+    The category x user leaderboard, built in two queries however many categories and users there are.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.group, cls.category, cls.other_category = get_test_categories()
+        cls.alice = User.objects.create_user(username="alice", password="pw", first_name="Alice", last_name="Silva")
+        cls.bob = User.objects.create_user(username="bob", password="pw")
+        create_answered_questions(
+            create_quiz_part(),
+            [(cls.category, {cls.alice: True, cls.bob: True})] * 2
+            + [(cls.category, {cls.alice: False, cls.bob: True})] * 2
+            + [(cls.other_category, {cls.alice: False})],
+        )
+
+    def test_leaderboard(self):
+        with self.assertNumQueries(2):
+            leaderboard = get_category_leaderboard()
+        self.assertEqual(len(leaderboard), Category.objects.count())
+        rows = {row["category_name"]: row["users"] for row in leaderboard}
+        # Sorted by xC, full names preferred over usernames
+        self.assertEqual(
+            rows[self.category.name],
+            [{"user": "bob", "xC": 2.0, "answered": 4}, {"user": "Alice Silva", "xC": 1.0, "answered": 4}],
+        )
+        self.assertEqual(rows[self.other_category.name], [{"user": "Alice Silva", "xC": 0.0, "answered": 1}])
+
+    def test_leaderboard_of_a_group(self):
+        with self.assertNumQueries(2):
+            leaderboard = get_category_leaderboard(category_group_id=self.group.pk)
+        self.assertEqual(
+            [row["category_name"] for row in leaderboard],
+            list(Category.objects.filter(group=self.group).values_list("name", flat=True)),
+        )
+
+    def test_min_answers(self):
+        with self.assertNumQueries(2):
+            leaderboard = get_category_leaderboard(min_answers=2)
+        rows = {row["category_name"]: row["users"] for row in leaderboard}
+        self.assertEqual(len(rows[self.category.name]), 2)
+        self.assertEqual(rows[self.other_category.name], [])
+
+
+@local_cache
+class AnswerMatrixTests(TestCase):
+    """
+    The in-memory mirror of the category rollups, refreshed with the rows changed since the previous refresh.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.group, cls.category, cls.other_category = get_test_categories()
+        cls.alice = User.objects.create_user(username="alice", password="pw")
+        cls.bob = User.objects.create_user(username="bob", password="pw")
+        cls.part = create_quiz_part()
+        cls.questions = create_answered_questions(
+            cls.part,
+            [
+                (cls.category, {cls.alice: True, cls.bob: False}),
+                (cls.category, {cls.alice: False}),
+                (cls.other_category, {cls.bob: True}),
+            ],
+        )
+
+    def setUp(self):
+        self.matrix = AnswerMatrix()
+        self.matrix.refresh()
+
+    def assertCounts(self, user_ids, category_ids, correct, total):
+        counts = self.matrix.counts(user_ids, category_ids)
+        self.assertEqual([array.tolist() for array in counts], [correct, total])
+
+    def test_counts(self):
+        # In the order asked for, with zeros for users and categories without answers
+        self.assertCounts(
+            [self.bob.pk, self.alice.pk, 0],
+            [self.other_category.pk, self.category.pk, 0],
+            [[1, 0, 0], [0, 1, 0], [0, 0, 0]],
+            [[1, 1, 0], [0, 2, 0], [0, 0, 0]],
+        )
+        self.assertCounts([], [self.category.pk], [], [])
+
+    def test_delta_refresh(self):
+        loaded_at = self.matrix.loaded_at
+        carol = User.objects.create_user(username="carol", password="pw")
+        create_answered_questions(self.part, [(self.other_category, {self.alice: True, carol: True})])
+        UserAnswer.objects.get(user=self.bob, question=self.questions[0]).delete()
+        self.matrix.refresh()
+
+        self.assertEqual(self.matrix.loaded_at, loaded_at)
+        self.assertCounts(
+            [self.alice.pk, self.bob.pk, carol.pk],
+            [self.category.pk, self.other_category.pk],
+            [[1, 1], [0, 1], [0, 1]],
+            [[2, 1], [0, 1], [0, 1]],
+        )
+
+    def test_rebuild_committed_after_the_refresh_overlap(self):
+        loaded_at = self.matrix.loaded_at
+        # A rebuild that commits long after the timestamp it writes: out of reach of the delta refresh
+        UserAnswer.objects.filter(user=self.alice, question=self.questions[1]).update(is_correct=True)
+        written_at = self.matrix.last_seen - AnswerMatrix.REFRESH_OVERLAP - timedelta(minutes=1)
+        with mock.patch("answers.utils.timezone.now", return_value=written_at):
+            with self.captureOnCommitCallbacks(execute=True):
+                rebuild_category_stats(user_ids=[self.alice.pk])
+        self.matrix.refresh()
+
+        self.assertNotEqual(self.matrix.loaded_at, loaded_at)
+        self.assertCounts([self.alice.pk], [self.category.pk], [[2]], [[2]])
+
+
+@local_cache
+class QuizUnansweredQuestionsTests(TestCase):
+    """
+    A quiz reduced to the questions the user has not answered, filtered in memory with the answered bitset.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        _, category, _ = get_test_categories()
+        cls.alice = User.objects.create_user(username="alice", password="pw")
+        cls.bob = User.objects.create_user(username="bob", password="pw")
+        first_part = create_quiz_part()
+        cls.quiz = first_part.quiz
+        cls.started = create_answered_questions(
+            first_part, [(category, {cls.alice: True}), (category, {cls.bob: False})], topic_title="Started"
+        )
+        cls.done = create_answered_questions(first_part, [(category, {cls.alice: False})], topic_title="Done")
+        create_answered_questions(create_quiz_part(sequence=2), [(category, {})] * 2, topic_title="New")
+
+    def setUp(self):
+        # The bitsets cached by a previous test would be served
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+
+    def get_unanswered(self) -> dict[str, list[str]]:
+        response = self.client.get(reverse("get-unanswered-quiz", kwargs={"pk": self.quiz.pk}))
+        self.assertEqual(response.status_code, 200)
+        return {
+            topic["title"]: [question["statement"] for question in topic["questions"]]
+            for part in response.json()["parts"]
+            for topic in part["topics"]
+        }
+
+    def test_unanswered_questions(self):
+        self.assertEqual(self.get_unanswered(), {"Started": ["Question 1"], "New": ["Question 0", "Question 1"]})
+        self.client.force_authenticate(self.bob)
+        self.assertEqual(
+            self.get_unanswered(),
+            {"Started": ["Question 0"], "Done": ["Question 0"], "New": ["Question 0", "Question 1"]},
+        )
+
+    def test_follows_the_answers_of_the_user(self):
+        self.get_unanswered()
+        with self.captureOnCommitCallbacks(execute=True):
+            UserAnswer.objects.create(user=self.alice, question=self.started[1], is_correct=True)
+            UserAnswer.objects.filter(user=self.alice, question=self.done[0]).delete()
+        self.assertEqual(self.get_unanswered(), {"Done": ["Question 0"], "New": ["Question 0", "Question 1"]})
+
+
+@local_cache
+class QuizConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="alice", password="pw")
+        cls.quiz = Quiz.objects.create(season=1, week="1")
+        cls.other_quiz = Quiz.objects.create(season=1, week="2")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        response = self.client.get(reverse("get-quiz", kwargs={"pk": self.quiz.pk}))
+        self.assertEqual(response.status_code, 200)
+        self.etag = response["ETag"]
+
+    def test_not_modified(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("get-quiz", kwargs={"pk": self.quiz.pk}), HTTP_IF_NONE_MATCH=self.etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_of_another_quiz(self):
+        url = reverse("get-quiz", kwargs={"pk": self.other_quiz.pk})
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=self.etag).status_code, 200)
+        url = reverse("get-quiz", kwargs={"pk": self.other_quiz.pk + 1000})
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=self.etag).status_code, 404)
+
+    def test_etag_after_a_change_to_another_quiz(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            create_answered_questions(create_quiz_part(week="2", sequence=2), [(get_test_categories()[1], {})])
+        url = reverse("get-quiz", kwargs={"pk": self.quiz.pk})
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=self.etag).status_code, 304)
+
+    def test_etag_after_a_change_to_the_quiz(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            create_answered_questions(create_quiz_part(week="1", sequence=2), [(get_test_categories()[1], {})])
+        url = reverse("get-quiz", kwargs={"pk": self.quiz.pk})
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=self.etag).status_code, 200)
+
+
+@local_cache
+class QuizSnapshotTests(TestCase):
+    """
+    Snapshots are re-rendered when their own quiz or the catalog changes, and only then.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.group, cls.category, cls.other_category = get_test_categories()
+        cls.questions = {}
+        for week in ("1", "2"):
+            part = create_quiz_part(week=week)
+            cls.questions[week] = create_answered_questions(part, [(cls.category, {})])[0]
+        cls.quiz, cls.other_quiz = cls.questions["1"].topic.quiz_part.quiz, cls.questions["2"].topic.quiz_part.quiz
+
+    def assertSnapshotKept(self, quiz, kept=True):
+        version = QuizSnapshot.objects.get(quiz=quiz).version
+        get_quiz_document(quiz.pk)
+        self.assertEqual(QuizSnapshot.objects.get(quiz=quiz).version == version, kept)
+
+    def setUp(self):
+        get_quiz_document(self.quiz.pk)
+        get_quiz_document(self.other_quiz.pk)
+
+    def test_served_from_the_snapshot(self):
+        with self.assertNumQueries(1):
+            document = get_quiz_document(self.quiz.pk)
+        self.assertEqual(json.loads(document)["week"], self.quiz.week)
+
+    def test_change_to_another_quiz(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.questions["2"].categories.add(self.other_category)
+            self.questions["2"].save()
+        self.assertSnapshotKept(self.quiz)
+        self.assertSnapshotKept(self.other_quiz, kept=False)
+
+    def test_change_to_the_quiz(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other_category.questions.add(self.questions["1"])
+        self.assertSnapshotKept(self.quiz, kept=False)
+        self.assertIn(self.other_category.name, get_quiz_document(self.quiz.pk))
+        self.assertSnapshotKept(self.other_quiz)
+
+    def test_category_renamed(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.name = "Renamed category"
+            self.category.save()
+        self.assertSnapshotKept(self.quiz, kept=False)
+        self.assertSnapshotKept(self.other_quiz, kept=False)
+
+
+@local_cache
+class QuizPartPresentationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="alice", password="pw")
+        cls.part = create_quiz_part()
+        cls.question = create_answered_questions(cls.part, [(get_test_categories()[1], {})])[0]
+        cls.url = reverse("download-quiz-part-ppt", kwargs={"pk": cls.part.quiz_id, "sequence": cls.part.sequence})
+
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        media_override = override_settings(MEDIA_ROOT=media_root.name)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+        self.client = APIClient()
+
+    def download(self) -> bytes:
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return b"".join(response.streaming_content)
+
+    def test_requires_authentication(self):
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+        self.assertFalse(QuizPart.objects.get(pk=self.part.pk).ppt_file)
+
+    def test_old_deck_deleted_after_the_new_one_is_committed(self):
+        self.client.force_authenticate(self.user)
+        self.download()
+        old_deck = QuizPart.objects.get(pk=self.part.pk).ppt_file
+        self.question.answer = "Changed answer"
+        self.question.save()
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.download()
+            new_deck = QuizPart.objects.get(pk=self.part.pk).ppt_file
+            self.assertNotEqual(new_deck.name, old_deck.name)
+            # Until the render commits, the old deck is still there for the clients downloading it
+            self.assertTrue(old_deck.storage.exists(old_deck.name))
+        for callback in callbacks:
+            callback()
+        self.assertFalse(old_deck.storage.exists(old_deck.name))
+        self.assertTrue(new_deck.storage.exists(new_deck.name))
+
+
+@local_cache
+class QuizImportTests(TestCase):
+    """
+    Re-importing a quiz updates the questions already there instead of adding copies.
+    """
+
+    def import_quiz(self, theme):
+        question = {"theme": theme, "question": "Capital of Peru?", "answer": "Lima", "team": "Others", "xP": 0.5}
+        with categorization_disabled(), redirect_stdout(io.StringIO()):
+            return create_quiz({"season": 1, "week": "1", "parts": [{"sequence": 1, "questions": [question]}]})
+
+    def test_reimport(self):
+        quiz = self.import_quiz("Geography")
+        self.import_quiz("Geography")
+        self.assertEqual(Topic.objects.filter(quiz_part__quiz=quiz).count(), 1)
+        self.assertEqual(Question.objects.filter(topic__quiz_part__quiz=quiz).count(), 1)
+
+    def test_reimport_after_renaming_the_topic(self):
+        quiz = self.import_quiz("Geografy")
+        topic = Topic.objects.get(quiz_part__quiz=quiz)
+        topic.title = "Geography"
+        topic.save()
+        self.import_quiz("Geography")
+        self.assertEqual(Topic.objects.filter(quiz_part__quiz=quiz).count(), 1)
+        self.assertEqual(Question.objects.filter(topic__quiz_part__quiz=quiz).count(), 1)
+
+    def test_topic_titles_are_unique_per_part(self):
+        quiz = self.import_quiz("Geography")
+        with self.assertRaises(IntegrityError):
+            Topic.objects.create(quiz_part=QuizPart.objects.get(quiz=quiz), title="Geography")
+
+
+class QuizPageParserTests(TestCase):
+    """
+    The single-pass row extraction gives the same output as the previous one, on the fixture pages.
+    Those are synthetic: the quiz site could not be reached to save real pages.
+    """
+
+    def test_same_output_as_the_legacy_parser(self):
+        pages = sorted(DEFAULT_PAGES.glob("*.html"))
+        self.assertTrue(pages)
+        for path in pages:
+            with self.subTest(page=path.name):
+                html = path.read_text(encoding="utf-8")
+                quiz_data = extract_quiz_data(parse_html(html))
+                self.assertTrue(any(quiz_data))
+                self.assertEqual(quiz_data, legacy_extract_quiz_data(BeautifulSoup(html, "html.parser")))
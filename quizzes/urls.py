@@ -6,17 +6,20 @@ from quizzes.views import (
     CategoryGroupListView,
     CategoryUserStatsView,
     ListQuizProgressView,
+    QuizPartPresentationView,
     QuizUnansweredQuestionsView,
     QuizView,
     RandomUnansweredTopicView,
     TopicCategorizationView,
     UpdateQuestionCategoriesView,
+    XTBatchView,
     XTView,
 )
 
 urlpatterns = [
     # api/quizzes/
     path("<int:pk>/", QuizView.as_view(), name="get-quiz"),
+    path("<int:pk>/parts/<int:sequence>/ppt/", QuizPartPresentationView.as_view(), name="download-quiz-part-ppt"),
     path("<int:pk>/unanswered/", QuizUnansweredQuestionsView.as_view(), name="get-unanswered-quiz"),
     path("categories/", CategoriesView.as_view(), name="list-all-categories"),
     path("categories/groups/", CategoryGroupListView.as_view(), name="list-all-groups"),
@@ -24,6 +27,7 @@ urlpatterns = [
     path("predictor/topics/categorize/", TopicCategorizationView.as_view(), name="categorize-topics"),
     path("predictor/order-of-play/", AptitudeView.as_view(), name="order-of-play"),
     path("predictor/topics/sort/", XTView.as_view(), name="sort-topics-per-user"),
+    path("predictor/topics/sort/batch/", XTBatchView.as_view(), name="sort-topics-per-scenario"),
     path("progress/", ListQuizProgressView.as_view(), name="quiz-progress"),
     path("topics/random/", RandomUnansweredTopicView.as_view(), name="random-unanswered-topic"),
     path(
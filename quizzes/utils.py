@@ -1,22 +1,34 @@
 import logging
+import threading
 import traceback
+from contextlib import contextmanager
 from difflib import get_close_matches
 
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
 from rapidfuzz import fuzz, process
 
 from openai_utils.client import ask_chatgpt
 from openai_utils.loaders import get_prompt
-from quizzes.models import Category, Question
+from quizstats.cache import bump_quiz_content_versions, bump_stats_version
+from quizzes.models import Category, Question, Quiz
+from quizzes.pools import invalidate_unanswered_topic_pools
 from quizzes.serializers import CategorySerializer
 
 logger = logging.getLogger(__name__)
 
+CATEGORIZATION_BATCH_SIZE = 20
+
+# Questions waiting for the current transaction to commit before being categorized
+_scheduled = threading.local()
+
 
 def classify_topics_list(topics: list[str]) -> list[dict]:
     categories = list(Category.objects.all())
     category_names = [category.name for category in categories]
     prompt = get_prompt("categorize_topics", topics="\n".join(topics), categories="\n".join(category_names))
-    raw_result = ask_chatgpt(prompt, model="gpt-4.1-mini")
+    raw_result = ask_chatgpt(prompt, model="gpt-4.1-mini", prompt_name="categorize_topics")
     results = []
     for line in raw_result.splitlines():
         if "->" not in line:
@@ -54,22 +66,10 @@ def format_categories_inline():
     return "\n".join(cat.name for cat in categories)
 
 
-def categorize_question(question: Question) -> None:
+def match_category_names(response: str, valid_category_names: list[str]) -> set[str]:
     """
-    Categorize a Question instance using ChatGPT.
-    - Returns None.
-    - If the question has existing categories, they are replaced only if new valid categories are found.
+    Map the comma-separated category names of an LLM response to the closest valid category names.
     """
-    categories_prompt = format_categories_inline()
-    prompt = get_prompt(
-        "categorize_question", question=question.statement, answer=question.answer, categories=categories_prompt
-    )
-    response = ask_chatgpt(prompt, model="gpt-4.1-mini")
-    if not response or response.strip().lower() == "none":
-        return  # do nothing, keep existing categories
-
-    valid_categories_qs = Category.objects.all()
-    valid_category_names = [cat.name for cat in valid_categories_qs]
     valid_category_names_lower = [name.lower() for name in valid_category_names]
 
     matched_categories = set()
@@ -80,7 +80,97 @@ def categorize_question(question: Question) -> None:
         if matches:
             matched_index = valid_category_names_lower.index(matches[0])
             matched_categories.add(valid_category_names[matched_index])
+    return matched_categories
+
+
+def categorize_questions(question_ids, batch_size: int = CATEGORIZATION_BATCH_SIZE) -> int:
+    """
+    Categorize many questions with one ChatGPT request per batch, keeping existing categories on a `none`
+    answer and replacing them only with valid matches.
+    Answers are matched back to the questions by id. Questions missing from a response stay uncategorized.
+    Returns the number of categorized questions.
+    """
+    questions = list(Question.objects.filter(id__in=question_ids).order_by("id"))
+    if not questions:
+        return 0
+    categories_by_name = {category.name: category for category in Category.objects.all()}
+    valid_category_names = list(categories_by_name)
+    categories_prompt = format_categories_inline()
+
+    categorized = 0
+    for start in range(0, len(questions), batch_size):
+        batch = {question.pk: question for question in questions[start : start + batch_size]}
+        entries = "\n".join(
+            f'{question.pk}. Question: "{question.statement}" Answer: "{question.answer}"'
+            for question in batch.values()
+        )
+        prompt = get_prompt("categorize_questions", questions=entries, categories=categories_prompt)
+        response = ask_chatgpt(prompt, model="gpt-4.1-mini", prompt_name="categorize_questions")
+
+        answered_ids = []
+        for line in (response or "").splitlines():
+            question_id, separator, raw_categories = line.partition(":")
+            question_id = question_id.strip().rstrip(".")
+            if not separator or not question_id.isdigit() or int(question_id) not in batch:
+                continue
+            question = batch[int(question_id)]
+            answered_ids.append(question.pk)
+            if raw_categories.strip().lower() == "none":
+                continue  # keep existing categories
+            matched_categories = match_category_names(raw_categories, valid_category_names)
+            if matched_categories:
+                question.categories.set([categories_by_name[name] for name in matched_categories])
+        if len(answered_ids) < len(batch):
+            logger.warning(f"Categorization response is missing {len(batch) - len(answered_ids)} questions")
+        Question.objects.filter(id__in=answered_ids).update(categorized_at=timezone.now())
+        categorized += len(answered_ids)
+    return categorized
+
 
-    # Only replace categories if we got new matches
-    if matched_categories:
-        question.categories.set(valid_categories_qs.filter(name__in=matched_categories))
+@contextmanager
+def categorization_disabled():
+    """
+    Skip the categorization of the questions created in this block, e.g. for bulk backfills.
+    They stay pending and can be categorized later with the `categorize_pending` command.
+    """
+    previous = getattr(_scheduled, "disabled", False)
+    _scheduled.disabled = True
+    try:
+        yield
+    finally:
+        _scheduled.disabled = previous
+
+
+def schedule_categorization(question_ids: list[int]):
+    """
+    Queue new questions for categorization once the current transaction commits.
+    All the questions created in one transaction are then categorized together, in batches.
+    """
+    if getattr(_scheduled, "disabled", False) or not question_ids:
+        return
+    if not hasattr(_scheduled, "question_ids"):
+        _scheduled.question_ids = []
+    _scheduled.question_ids.extend(question_ids)
+    # One callback per call: callbacks of rolled back savepoints are dropped, the first remaining one does it all.
+    # robust: the transaction is already committed, an LLM failure only leaves the questions pending.
+    transaction.on_commit(_categorize_scheduled_questions, robust=True)
+
+
+def _categorize_scheduled_questions():
+    question_ids = getattr(_scheduled, "question_ids", [])
+    _scheduled.question_ids = []
+    if question_ids:
+        categorize_questions(question_ids)
+
+
+def record_created_questions(quiz: Quiz, question_ids: list[int]):
+    """
+    Apply what the Question signals would have done for questions inserted with bulk_create, which skips them.
+    """
+    if not question_ids:
+        return
+    Quiz.objects.filter(pk=quiz.pk).update(total_questions=F("total_questions") + len(question_ids))
+    invalidate_unanswered_topic_pools()
+    bump_quiz_content_versions([quiz.pk])
+    bump_stats_version()
+    schedule_categorization(question_ids)
@@ -3,6 +3,7 @@ set -e
 
 echo "Running migrations..."
 python manage.py migrate
+python manage.py createcachetable
 python manage.py collectstatic --noinput
 
 echo "Checking for default superuser..."
@@ -25,5 +26,8 @@ else:
         print('Superuser already exists')
 "
 
+echo "Starting job worker..."
+python manage.py run_worker &
+
 echo "Starting server..."
 exec python manage.py runserver 0.0.0.0:8000
\ No newline at end of file
@@ -0,0 +1,91 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from answers.models import UserAnswer
+from quizstats.testing import create_answered_questions, create_quiz_part, get_test_categories, local_cache
+from quizzes.models import Category, CategoryGroup
+
+User = get_user_model()
+
+
+@local_cache
+class TeamCategoryStatsTests(TestCase):
+    """
+    A team's stats add up the rollups of its current members only.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.group, cls.category, cls.other_category = get_test_categories()
+        cls.alice = User.objects.create_user(username="alice", password="pw")
+        cls.bob = User.objects.create_user(username="bob", password="pw")
+        cls.outsider = User.objects.create_user(username="carol", password="pw")
+        cls.team = Group.objects.create(name="Team")
+        cls.team.user_set.add(cls.alice, cls.bob)
+        cls.questions = create_answered_questions(
+            create_quiz_part(),
+            [(cls.category, {cls.alice: True, cls.bob: True, cls.outsider: False})] * 2
+            + [(cls.category, {cls.alice: False, cls.bob: False, cls.outsider: True})] * 2
+            + [(cls.other_category, {cls.alice: False, cls.bob: False, cls.outsider: False})],
+        )
+
+    def setUp(self):
+        # Versions are only bumped on commit, so responses cached by a previous test would be served
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+
+    def test_category_stats(self):
+        url = reverse("category-stats-by-team", kwargs={"pk": self.team.pk})
+        # The team, its membership check, its member ids and the stats of every category
+        with self.assertNumQueries(4):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        stats = {row["category_id"]: row for row in response.json()}
+        self.assertEqual(len(stats), Category.objects.count())
+        # The answers of the outsider are left out
+        self.assertEqual(stats[self.category.pk]["answered"], 8)
+        self.assertEqual(stats[self.category.pk]["xC"], 1.0)
+        self.assertEqual(stats[self.other_category.pk]["answered"], 2)
+        self.assertEqual(stats[self.other_category.pk]["xC"], 0.0)
+
+    def test_category_group_stats(self):
+        url = reverse("category-group-stats-by-team", kwargs={"pk": self.team.pk})
+        with self.assertNumQueries(4):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        stats = {row["group_id"]: row for row in response.json()}
+        self.assertEqual(len(stats), CategoryGroup.objects.count())
+        self.assertEqual(stats[self.group.pk]["answered"], 10)
+        self.assertAlmostEqual(stats[self.group.pk]["xC"], 4 / 10 * 2)
+
+    def test_stats_follow_membership(self):
+        url = reverse("category-stats-by-team", kwargs={"pk": self.team.pk})
+        self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.team.user_set.remove(self.bob)
+        stats = {row["category_id"]: row for row in self.client.get(url).json()}
+        self.assertEqual(stats[self.category.pk]["answered"], 4)
+
+    def test_stats_follow_the_answers_of_members(self):
+        url = reverse("category-stats-by-team", kwargs={"pk": self.team.pk})
+        self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            UserAnswer.objects.filter(user=self.outsider, question=self.questions[-1]).delete()
+        # Not a member: the cached stats are still served, after the team and its membership check
+        with self.assertNumQueries(2):
+            self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            UserAnswer.objects.filter(user=self.bob, question=self.questions[-1]).delete()
+        stats = {row["category_id"]: row for row in self.client.get(url).json()}
+        self.assertEqual(stats[self.other_category.pk]["answered"], 1)
+
+    def test_non_member(self):
+        self.client.force_authenticate(self.outsider)
+        response = self.client.get(reverse("category-stats-by-team", kwargs={"pk": self.team.pk}))
+        self.assertEqual(response.status_code, 403)
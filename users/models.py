@@ -1,7 +1,24 @@
 from django.contrib.auth.models import AbstractUser
+from django.db import models
 
 
 class User(AbstractUser):
     @property
     def full_name(self):
         return self.get_full_name()
+
+
+class PlayerAlias(models.Model):
+    """
+    Spelling of a player's name on the quiz pages that does not match the user's name, e.g. a nickname.
+    """
+
+    name = models.CharField(max_length=150, unique=True)
+    user = models.ForeignKey(to=User, on_delete=models.CASCADE, related_name="player_aliases")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name_plural = "player aliases"
+
+    def __str__(self):
+        return f"{self.name} → {self.user.full_name}"
@@ -0,0 +1,88 @@
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from rapidfuzz import fuzz, process
+
+from answers.matching import normalize
+from users.models import PlayerAlias
+
+User = get_user_model()
+
+# Minimum token_sort_ratio of a fuzzy match, about the difflib cutoff (0.7) the import used before
+MATCH_CUTOFF = 70
+
+
+def initials_match(tokens: list[str], candidate_tokens: list[str]) -> bool:
+    """
+    Whether the words of a name match the words of a full name one by one, each word equal or its initial,
+    e.g. `j silva` and `joao silva`.
+    """
+    if len(tokens) != len(candidate_tokens):
+        return False
+    return all(
+        token == candidate or (len(token) == 1 and candidate.startswith(token))
+        for token, candidate in zip(tokens, candidate_tokens)
+    )
+
+
+class PlayerNameResolver:
+    """
+    Maps the player names of the quiz pages to users. Build one per import run: users and aliases are loaded once.
+    A name is resolved, in order, by a stored PlayerAlias, the normalized full name, its initials
+    (`J. Silva` for `João Silva`) and the closest full name. Each distinct name is resolved once, and every answer
+    of a name without a user is counted for `report_unmatched`.
+    """
+
+    def __init__(self):
+        self.users = {}
+        for user in User.objects.exclude(first_name="", last_name="").order_by("pk"):
+            self.users.setdefault(normalize(user.full_name), user)
+        self.aliases = {normalize(alias.name): alias.user for alias in PlayerAlias.objects.select_related("user")}
+        self.choices = list(self.users)
+        self.unmatched = Counter()
+        self._resolved = {}
+
+    def resolve_many(self, names):
+        """
+        Resolve the names not seen yet. Those without an alias, exact or initials match are scored against
+        every full name in one batch.
+        """
+        fuzzy = {}
+        for name in set(names) - self._resolved.keys():
+            key = normalize(name)
+            user = self.aliases.get(key) or self.users.get(key)
+            abbreviated = any(len(token) == 1 for token in key.split())
+            if user is None and abbreviated:
+                # An ambiguous abbreviation is left unmatched rather than guessed by the fuzzy matching
+                user = self._match_initials(key)
+            if user or abbreviated or not key or not self.choices:
+                self._resolved[name] = user
+            else:
+                fuzzy[name] = key
+        if not fuzzy:
+            return
+        scores = process.cdist(
+            list(fuzzy.values()), self.choices, scorer=fuzz.token_sort_ratio, score_cutoff=MATCH_CUTOFF
+        )
+        for row, name in zip(scores, fuzzy):
+            best = row.argmax()
+            self._resolved[name] = self.users[self.choices[best]] if row[best] >= MATCH_CUTOFF else None
+
+    def resolve(self, name: str):
+        """
+        The user of a player name, or None, which counts one dropped answer for the name.
+        """
+        if name not in self._resolved:
+            self.resolve_many([name])
+        user = self._resolved[name]
+        if user is None:
+            self.unmatched[name] += 1
+        return user
+
+    def report_unmatched(self) -> list[str]:
+        return [f"{name}: {count} answers" for name, count in self.unmatched.most_common()]
+
+    def _match_initials(self, key: str):
+        tokens = key.split()
+        candidates = [choice for choice in self.choices if initials_match(tokens, choice.split())]
+        return self.users[candidates[0]] if len(candidates) == 1 else None
@@ -0,0 +1,24 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+
+from quizstats.cache import bump_version_on_commit, stats_version
+
+User = get_user_model()
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_team_stats_on_membership_change(sender, instance, action, reverse, pk_set, **kwargs):
+    # Team stats are cached per team and computed from its members, so they change with the membership
+    if reverse:
+        team_ids = {instance.pk}
+    elif action == "pre_clear":
+        # clear() does not send the removed pks, so remember them for post_clear
+        instance._cleared_team_ids = set(instance.groups.values_list("id", flat=True))
+        return
+    elif action == "post_clear":
+        team_ids = getattr(instance, "_cleared_team_ids", set())
+    else:
+        team_ids = pk_set
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_version_on_commit(*(stats_version(f"team:{team_id}") for team_id in team_ids))
@@ -0,0 +1,79 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from answers.models import UserAnswer
+from quizstats.testing import create_answered_questions, create_quiz_part, get_test_categories, local_cache
+from quizzes.models import Category, CategoryGroup
+
+User = get_user_model()
+
+
+@local_cache
+class UserCategoryStatsTests(TestCase):
+    """
+    A user's category and category group stats, read from the rollups.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.group, cls.category, cls.other_category = get_test_categories()
+        cls.user = User.objects.create_user(username="alice", password="pw")
+        cls.questions = create_answered_questions(
+            create_quiz_part(),
+            [(cls.category, {cls.user: True})] * 3
+            + [(cls.category, {cls.user: False})]
+            + [(cls.other_category, {cls.user: True})] * 2,
+        )
+
+    def setUp(self):
+        # Versions are only bumped on commit, so responses cached by a previous test would be served
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_category_stats(self):
+        url = reverse("category-stats-by-user", kwargs={"pk": self.user.pk})
+        # The user and the stats of every category, whatever the size of the catalog
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        stats = {row["category_id"]: row for row in response.json()}
+        self.assertEqual(len(stats), Category.objects.count())
+        self.assertEqual(stats[self.category.pk]["answered"], 4)
+        self.assertEqual(stats[self.category.pk]["xC"], 1.5)
+        # Below MIN_ANSWERS the xC is not computed
+        self.assertEqual(stats[self.other_category.pk]["answered"], 2)
+        self.assertEqual(stats[self.other_category.pk]["xC"], 0.0)
+
+        # Served from the cache afterwards
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(url).json(), response.json())
+
+    def test_category_group_stats(self):
+        url = reverse("category-group-stats-by-user", kwargs={"pk": self.user.pk})
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        stats = {row["group_id"]: row for row in response.json()}
+        self.assertEqual(len(stats), CategoryGroup.objects.count())
+        self.assertEqual(stats[self.group.pk]["answered"], 6)
+        self.assertAlmostEqual(stats[self.group.pk]["xC"], 5 / 6 * 2)
+        self.assertTrue(all(row["answered"] == 0 for group_id, row in stats.items() if group_id != self.group.pk))
+
+    def test_cached_stats_follow_the_answers_of_the_user(self):
+        url = reverse("category-stats-by-user", kwargs={"pk": self.user.pk})
+        self.client.get(url)
+        other_user = User.objects.create_user(username="bob", password="pw")
+        with self.captureOnCommitCallbacks(execute=True):
+            UserAnswer.objects.create(user=other_user, question=self.questions[0], is_correct=True)
+        # The answers of other users leave the cached stats of this one alone
+        with self.assertNumQueries(1):
+            self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            UserAnswer.objects.filter(user=self.user, question=self.questions[0]).delete()
+        stats = {row["category_id"]: row for row in self.client.get(url).json()}
+        self.assertEqual(stats[self.category.pk]["answered"], 3)
@@ -5,7 +5,6 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from answers.models import UserAnswer
 from quizzes.mixins import CategoryGroupStatsMixin, CategoryStatsMixin
 from teams.serializers import TeamSerializer
 from users.serializers import UserDetailSerializer, UserShortSerializer
@@ -46,19 +45,17 @@ class UserCategoryGroupStatsView(CategoryGroupStatsMixin, GenericAPIView):
     permission_classes = [IsAuthenticated]
     queryset = User.objects.all()
 
-    def get_user_answers(self):
-        user = self.get_object()
-        return (
-            UserAnswer.objects.filter(user=user)
-            .select_related("question")
-            .prefetch_related("question__categories__group")
-        )
+    stats_subject = "user"
+
+    def get_user_ids(self, subject):
+        return [subject.pk]
 
 
 class UserCategoryStatsView(CategoryStatsMixin, GenericAPIView):
     permission_classes = [IsAuthenticated]
     queryset = User.objects.all()
 
-    def get_user_answers(self):
-        user = self.get_object()
-        return UserAnswer.objects.filter(user=user).select_related("question").prefetch_related("question__categories")
+    stats_subject = "user"
+
+    def get_user_ids(self, subject):
+        return [subject.pk]